@@ -45,9 +45,9 @@ echo ""
 
 # 2. Install Python dependencies
 echo "Installing Python dependencies..."
-pip3 install --break-system-packages -q beautifulsoup4 requests 2>/dev/null \
-  || pip3 install --user -q beautifulsoup4 requests 2>/dev/null \
-  || pip3 install -q beautifulsoup4 requests
+pip3 install --break-system-packages -q beautifulsoup4 lxml requests websocket-client 2>/dev/null \
+  || pip3 install --user -q beautifulsoup4 lxml requests websocket-client 2>/dev/null \
+  || pip3 install -q beautifulsoup4 lxml requests websocket-client
 echo "  Done."
 echo ""
 
@@ -31,60 +31,123 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
+import multiprocessing
+import os
+import queue
 import random
 import re
-import subprocess
+import signal
+import socket
 import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait,
+)
+from functools import lru_cache
+from multiprocessing import shared_memory
 from pathlib import Path
-
-import requests
+from urllib.parse import urlparse
 
 # Import the extraction module from the same directory
 sys.path.insert(0, str(Path(__file__).parent))
-from wechat_extract import extract_article, safe_dirname
+from cdp_client import CDPClient, Tab, get_browser_info
+from crawl_common import Checkpoint, load_manifest, save_manifest, tree_size
+from wechat_extract import (
+    extract_article, new_image_session, safe_dirname, set_image_workers,
+)
 
 # ---------------------------------------------------------------------------
 # Defaults
 # ---------------------------------------------------------------------------
 
-CDP_FETCH_SCRIPT = Path(__file__).parent / "cdp_fetch.js"
 CDP_PORT_FILES = [
     Path.home() / ".chrome-crawl" / "cdp-port",
     Path.home() / ".openclaw" / "chrome-debug-port",
 ]
-CDP_TMP_FILE = Path("/tmp/batch_cdp_fetch.html")
 
 DEFAULT_CDP_PORT = "9222"
+PORT_PROBE_TIMEOUT = 0.05  # seconds; the candidate ports are all on localhost
 DEFAULT_DELAY = "2-5"
+DEFAULT_TABS = 3        # parallel Chrome tabs fetching pages
+# Extraction processes: CPUs this process may actually run on
+DEFAULT_WORKERS = (len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity")
+                   else os.cpu_count() or 1)
 
 # Anti-crawl settings
 PAUSE_EVERY = 200       # pause after every N articles
 PAUSE_DURATION = 20     # seconds
 BACKOFF_BASE = 5        # seconds (exponential: 5, 15, 45)
 MAX_RETRIES = 3
-RATE_LIMIT_PAUSE = 60   # seconds on anti-crawl page
+RATE_LIMIT_PAUSE = 60   # seconds a host is held after an anti-crawl page, at least
+MAX_HOST_DELAY = 120    # cap for a host's adaptive delay and pause, seconds
+EASE_AFTER = 20         # consecutive clean pages before a host's delay eases
+EASE_FACTOR = 0.9       # delay multiplier applied when easing
+ANTI_CRAWL_MARKER = "环境异常"  # text of the WeChat anti-crawl block page
+ANTI_CRAWL_SCAN = 3000  # chars of HTML to scan for the marker
+
+# Image downloads in flight across all extraction workers together
+IMG_DOWNLOADS = 16
+
+# Raw HTML hand-off to extraction workers via shared memory
+SHM_BLOCK_SIZE = 4 * 1024 * 1024  # larger pages are pickled as before
+
+# Progress output: one line per article, stdout flushed every N lines
+LOG_FLUSH_EVERY = 16
+
+# Content-addressed extraction results, keyed by SHA-256 of the raw HTML
+CACHE_DIR_NAME = ".cache"
+
+# Article statuses that count as finished (skipped on resume unless --force)
+DONE_STATUSES = frozenset(("downloaded", "extracted"))
 
 
 # ---------------------------------------------------------------------------
-# Manifest management
+# Extraction result cache
 # ---------------------------------------------------------------------------
 
-def load_manifest(output_dir: Path) -> list:
-    """Load manifest.json from output directory."""
-    manifest_path = output_dir / "manifest.json"
-    if manifest_path.exists():
-        return json.loads(manifest_path.read_text(encoding="utf-8"))
-    return []
+def _cache_path(output_dir: Path, digest: str) -> Path:
+    return output_dir / CACHE_DIR_NAME / digest[:2] / f"{digest}.json"
 
 
-def save_manifest(articles: list, output_dir: Path):
-    """Save manifest.json to output directory."""
-    output_dir.mkdir(parents=True, exist_ok=True)
-    manifest_path = output_dir / "manifest.json"
-    manifest_path.write_text(
-        json.dumps(articles, ensure_ascii=False, indent=2),
+def load_cached_result(output_dir: Path, digest: str, seq: int,
+                       download_img: bool) -> dict | None:
+    """
+    Return a cached extract_article result for this HTML digest, or None.
+
+    Only valid if it was extracted under the same seq (the directory name
+    depends on it), with images if images are wanted now, and its output
+    files are still on disk.
+    """
+    path = _cache_path(output_dir, digest)
+    if not path.exists():
+        return None
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    result = entry.get("result", {})
+    if entry.get("seq") != seq or (download_img and not entry.get("images")):
+        return None
+    for key in ("html_path", "md_path"):
+        if not result.get(key) or not Path(result[key]).exists():
+            return None
+    return result
+
+
+def store_cached_result(output_dir: Path, digest: str, seq: int,
+                        download_img: bool, result: dict):
+    """Cache a clean extraction; results with errors are left to be redone."""
+    if result.get("errors") or result.get("img_stats", {}).get("failed"):
+        return
+    path = _cache_path(output_dir, digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"seq": seq, "images": download_img, "result": result},
+                   ensure_ascii=False),
         encoding="utf-8",
     )
 
@@ -93,6 +156,8 @@ def save_manifest(articles: list, output_dir: Path):
 # URL input handling
 # ---------------------------------------------------------------------------
 
+URL_PREFIXES = ("http://", "https://")
+
 def parse_urls(source: str) -> list[str]:
     """
     Parse URLs from a source, which can be:
@@ -101,7 +166,7 @@ def parse_urls(source: str) -> list[str]:
 
     Returns a deduplicated list of URLs in input order.
     """
-    if source.startswith("http://") or source.startswith("https://"):
+    if source.startswith(URL_PREFIXES):
         return [source.strip()]
 
     path = Path(source)
@@ -116,7 +181,7 @@ def parse_urls(source: str) -> list[str]:
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            if not line.startswith("http://") and not line.startswith("https://"):
+            if not line.startswith(URL_PREFIXES):
                 print(f"  WARNING: Skipping non-URL at line {line_num}: {line[:60]}")
                 continue
             if line in seen:
@@ -161,29 +226,50 @@ def build_manifest_from_urls(urls: list[str], existing: list) -> list:
 # CDP helpers
 # ---------------------------------------------------------------------------
 
+def _port_is_open(port: str) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", int(port)), timeout=PORT_PROBE_TIMEOUT):
+            return True
+    except (OSError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
 def get_cdp_port(cli_port: str | None) -> str:
-    """Determine CDP port: CLI arg > port files > default."""
+    """
+    Determine CDP port: CLI arg > port files > default.
+
+    Port files can be stale (Chrome restarted on another port), so the first
+    candidate that accepts a TCP connection wins; if none does, the first
+    candidate is returned and check_chrome_ready reports it.
+    """
     if cli_port:
         return cli_port
+    candidates = []
     for port_file in CDP_PORT_FILES:
-        if port_file.exists():
+        try:
             port = port_file.read_text().strip()
-            if port:
-                return port
-    return DEFAULT_CDP_PORT
-
-
-def check_chrome_ready(cdp_port: str):
-    """Verify Chrome CDP is reachable. Exit if not."""
+        except OSError:
+            continue
+        if port and port not in candidates:
+            candidates.append(port)
+    if DEFAULT_CDP_PORT not in candidates:
+        candidates.append(DEFAULT_CDP_PORT)
+    for port in candidates:
+        if _port_is_open(port):
+            return port
+    return candidates[0]
+
+
+def check_chrome_ready(cdp_port: str) -> CDPClient:
+    """Verify Chrome CDP is reachable and open a persistent connection. Exit if not."""
     try:
-        resp = requests.get(
-            f"http://127.0.0.1:{cdp_port}/json/version", timeout=5
-        )
-        resp.raise_for_status()
-        info = resp.json()
+        info = get_browser_info(cdp_port)
         browser = info.get("Browser", "unknown")
+        client = CDPClient(info["webSocketDebuggerUrl"])
         print(f"Chrome CDP ready on port {cdp_port} ({browser})")
-    except requests.ConnectionError:
+        return client
+    except ConnectionError:
         print(f"ERROR: Cannot connect to Chrome CDP on port {cdp_port}")
         print("Make sure Chrome is running with --remote-debugging-port")
         sys.exit(1)
@@ -201,27 +287,17 @@ def parse_delay(delay_str: str) -> tuple[float, float]:
     return val, val
 
 
-def download_raw_html_cdp(url: str, cdp_port: str) -> str | None:
+def download_raw_html_cdp(url: str, tab: Tab, gate: "FetchGate") -> str | None:
     """Download page HTML via Chrome CDP (real browser TLS fingerprint)."""
     for attempt in range(MAX_RETRIES + 1):
         try:
-            result = subprocess.run(
-                ["node", str(CDP_FETCH_SCRIPT), cdp_port, url, str(CDP_TMP_FILE)],
-                capture_output=True, text=True, timeout=60,
-            )
-            if result.returncode != 0:
-                err = result.stderr.strip()
-                print(f"    CDP attempt {attempt + 1}: {err[:120]}")
-                if attempt < MAX_RETRIES:
-                    time.sleep(BACKOFF_BASE * (2 ** attempt))
-                continue
+            gate.wait_turn(url)
+            html_text = tab.fetch_html(url)
 
-            html_text = CDP_TMP_FILE.read_text(errors="replace")
-
-            # Check for WeChat anti-crawl page
-            if "环境异常" in html_text[:3000]:
-                print(f"    Anti-crawl page detected, pausing {RATE_LIMIT_PAUSE}s...")
-                time.sleep(RATE_LIMIT_PAUSE)
+            # Check for WeChat anti-crawl page: back off the whole host
+            if html_text.find(ANTI_CRAWL_MARKER, 0, ANTI_CRAWL_SCAN) >= 0:
+                pause = gate.backoff(url)
+                print(f"    Anti-crawl page detected, pausing host {pause:.0f}s...")
                 continue
 
             if len(html_text) < 1000:
@@ -230,9 +306,10 @@ def download_raw_html_cdp(url: str, cdp_port: str) -> str | None:
                     time.sleep(BACKOFF_BASE * (2 ** attempt))
                 continue
 
+            gate.record_ok(url)
             return html_text
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print(f"    CDP timeout (attempt {attempt + 1})")
             if attempt < MAX_RETRIES:
                 time.sleep(BACKOFF_BASE * (2 ** attempt))
@@ -244,6 +321,196 @@ def download_raw_html_cdp(url: str, cdp_port: str) -> str | None:
     return None
 
 
+# ---------------------------------------------------------------------------
+# Fetch pipeline
+# ---------------------------------------------------------------------------
+
+class HostLimiter:
+    """
+    Adaptive navigation spacing for one host.
+
+    Starts at the --delay range. Each anti-crawl page doubles the base delay
+    (capped at MAX_HOST_DELAY) and holds the host for a pause of at least
+    RATE_LIMIT_PAUSE, doubling (up to MAX_HOST_DELAY) while block pages keep
+    coming; a clean page resets the pause. Every EASE_AFTER clean pages in
+    a row shrink the delay by EASE_FACTOR, never below the configured
+    minimum. The --delay spread is kept as jitter.
+
+    hold_until is when the latest pause ends; slots booked before it was
+    set are re-booked by FetchGate.wait_turn.
+    """
+
+    def __init__(self, delay_min: float, delay_max: float):
+        self.min_delay = delay_min
+        self.spread = delay_max - delay_min
+        self.current_delay = delay_min
+        self.pause = 0.0
+        self.hold_until = 0.0
+        self.next_start = 0.0
+        self.consecutive_ok = 0
+
+    def reserve(self, now: float) -> float:
+        """Return this navigation's start time and book the next slot."""
+        start = max(now, self.next_start)
+        self.next_start = start + self.current_delay + random.uniform(0, self.spread)
+        return start
+
+    def backoff(self, now: float) -> float:
+        self.consecutive_ok = 0
+        self.current_delay = min(max(self.current_delay * 2, BACKOFF_BASE), MAX_HOST_DELAY)
+        self.pause = min(max(self.pause * 2, RATE_LIMIT_PAUSE), MAX_HOST_DELAY)
+        self.hold_until = max(self.hold_until, now + self.pause)
+        self.next_start = max(self.next_start, self.hold_until)
+        return self.pause
+
+    def record_ok(self):
+        self.pause = 0.0
+        self.consecutive_ok += 1
+        if self.consecutive_ok >= EASE_AFTER:
+            self.consecutive_ok = 0
+            self.current_delay = max(self.current_delay * EASE_FACTOR, self.min_delay)
+
+
+class FetchGate:
+    """
+    Anti-crawl pacing shared by all tab workers.
+
+    Navigations to the same host are spaced start-to-start by that host's
+    HostLimiter (so the delay overlaps page loads and extraction rather than
+    adding to them), and every PAUSE_EVERY articles all workers stop for
+    PAUSE_DURATION.
+    """
+
+    def __init__(self, delay_min: float, delay_max: float):
+        self.delay_min = delay_min
+        self.delay_max = delay_max
+        self._lock = threading.Lock()
+        self._hosts: dict[str, HostLimiter] = {}
+        self._started = 0
+
+    def count_article(self):
+        """Count an article; hold every worker during the periodic pause."""
+        with self._lock:
+            if self._started > 0 and self._started % PAUSE_EVERY == 0:
+                print(f"  === Pausing {PAUSE_DURATION}s after {self._started} articles ===")
+                time.sleep(PAUSE_DURATION)
+            self._started += 1
+
+    def _host(self, url: str) -> HostLimiter:
+        host = urlparse(url).netloc
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostLimiter(self.delay_min, self.delay_max)
+        return limiter
+
+    def wait_turn(self, url: str):
+        """Block until this host's next navigation slot, then reserve the one after."""
+        with self._lock:
+            limiter = self._host(url)
+            now = time.monotonic()
+            start = limiter.reserve(now)
+        while True:
+            if start > now:
+                time.sleep(start - now)
+            with self._lock:
+                # A block page seen while this tab slept puts the host on
+                # hold past the booked slot: book a new one after the hold
+                if limiter.hold_until <= start:
+                    return
+                now = time.monotonic()
+                start = limiter.reserve(now)
+
+    def backoff(self, url: str) -> float:
+        """Anti-crawl page seen: slow this host down; returns its pause in seconds."""
+        with self._lock:
+            return self._host(url).backoff(time.monotonic())
+
+    def record_ok(self, url: str):
+        with self._lock:
+            self._host(url).record_ok()
+
+
+class HtmlBlocks:
+    """
+    Shared-memory blocks for passing raw HTML to extraction workers.
+
+    Submitting the HTML string itself pickles megabytes through the pool's
+    pipe; instead the bytes are copied into a free block and only
+    (block name, length) is sent. Blocks are created on demand, reused once
+    their extraction finishes, and unlinked by close().
+    """
+
+    def __init__(self, size: int = SHM_BLOCK_SIZE):
+        self.size = size
+        self._blocks: dict[str, shared_memory.SharedMemory] = {}
+        self._free: list[str] = []
+
+    def put(self, data: bytes) -> tuple[str, int] | None:
+        """Copy data into a free block; None if it does not fit."""
+        if len(data) > self.size:
+            return None
+        if self._free:
+            name = self._free.pop()
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=self.size)
+            name = shm.name
+            self._blocks[name] = shm
+        self._blocks[name].buf[:len(data)] = data
+        return name, len(data)
+
+    def release(self, ref):
+        if isinstance(ref, tuple):
+            self._free.append(ref[0])
+
+    def close(self):
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+        self._free.clear()
+
+
+_worker_session = None
+
+
+def _init_extract_worker(img_workers: int):
+    """Process-pool initializer: pooled image session and image download cap per worker."""
+    global _worker_session
+    set_image_workers(img_workers)
+    _worker_session = new_image_session()
+
+
+def _extract_in_worker(html_ref, articles_dir: str, seq: int,
+                       download_img: bool) -> dict:
+    """html_ref is (shared block name, length) from HtmlBlocks, or the HTML itself."""
+    if isinstance(html_ref, tuple):
+        name, length = html_ref
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            raw_html = bytes(shm.buf[:length]).decode("utf-8")
+        finally:
+            # Only the parent (HtmlBlocks.close) unlinks the block
+            shm.close()
+    else:
+        raw_html = html_ref
+    return extract_article(raw_html, articles_dir, seq=seq,
+                           download_img=download_img, session=_worker_session)
+
+
+def _fetch_worker(tab: Tab, work: queue.Queue, results: queue.Queue,
+                  gate: FetchGate):
+    """Pull articles off the work queue, fetch them on `tab`, push the HTML."""
+    while True:
+        try:
+            article = work.get_nowait()
+        except queue.Empty:
+            return
+        gate.count_article()
+        started = time.time()
+        raw_html = download_raw_html_cdp(article["url"], tab, gate)
+        results.put((article, raw_html, started))
+
+
 # ---------------------------------------------------------------------------
 # Subcommand: crawl
 # ---------------------------------------------------------------------------
@@ -275,20 +542,20 @@ def cmd_crawl(args):
 
     # Resolve CDP port and check readiness
     cdp_port = get_cdp_port(args.cdp_port)
-    check_chrome_ready(cdp_port)
-
-    # Parse delay
-    delay_min, delay_max = parse_delay(args.delay)
+    cdp = check_chrome_ready(cdp_port)
 
     # Create articles directory
     articles_dir.mkdir(parents=True, exist_ok=True)
 
-    # Filter articles to process
+    # Filter articles to process and count finished ones in a single pass
     to_process = []
+    already_done = 0
     for a in articles:
+        done = a.get("status") in DONE_STATUSES
+        already_done += done
         if not a.get("url"):
             continue
-        if not args.force and a.get("status") in ("downloaded", "extracted"):
+        if done and not args.force:
             continue
         to_process.append(a)
 
@@ -296,81 +563,146 @@ def cmd_crawl(args):
         to_process = to_process[:args.limit]
 
     total = len(to_process)
-    already_done = sum(
-        1 for a in articles
-        if a.get("status") in ("downloaded", "extracted")
-    )
 
     print(f"Total in manifest: {len(articles)}, already done: {already_done}")
     print(f"To process: {total}")
     if total == 0:
         print("Nothing to do!")
+        cdp.close()
         return
 
     download_images = not args.no_images
 
-    # Shared session for image downloads (images use requests, CDN is fine)
-    img_session = requests.Session()
+    # Tab workers fetch pages concurrently; extraction runs in a process pool,
+    # so HTML parsing uses other cores while the next navigations proceed.
+    work = queue.Queue()
+    for a in to_process:
+        work.put(a)
+    n_tabs = max(1, min(args.tabs, total))
+    n_workers = max(1, min(args.workers, total))
+    results = queue.Queue(maxsize=n_tabs)
+    gate = FetchGate(*parse_delay(args.delay))
+    tabs = [cdp.open_tab() for _ in range(n_tabs)]
+    if not download_images:
+        # Images, CSS and fonts are never used; don't let Chrome fetch them
+        for tab in tabs:
+            tab.block_resources()
+    for tab in tabs:
+        threading.Thread(
+            target=_fetch_worker, args=(tab, work, results, gate), daemon=True,
+        ).start()
+    print(f"Fetching with {n_tabs} tab(s), extracting with {n_workers} worker(s)")
 
     stats = {"ok": 0, "failed": 0}
+    failed = []  # articles that failed in this run, for the closing report
     start_time = time.time()
-
-    for idx, article in enumerate(to_process):
-        seq = article.get("seq", idx + 1)
-        url = article["url"]
-        title_hint = article.get("title") or url[:60]
-
-        print(f"\n[{idx + 1}/{total}] #{seq} {title_hint}...")
-
-        # Periodic pause
-        if idx > 0 and idx % PAUSE_EVERY == 0:
-            print(f"  === Pausing {PAUSE_DURATION}s after {idx} articles ===")
-            time.sleep(PAUSE_DURATION)
-
-        # Download raw HTML via Chrome CDP
-        raw_html = download_raw_html_cdp(url, cdp_port)
-        if raw_html is None:
-            print(f"  FAILED to download: {url}")
+    done_count = 0
+
+    # Batched manifest writes; flushed on normal exit, Ctrl+C, or SIGTERM
+    checkpoint = Checkpoint(articles, output_dir)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    out = sys.stdout
+
+    def finish(article: dict, started: float, future=None, digest: str = "",
+               cached: dict = None):
+        """Record one article's outcome (no future and no cached result = failed download)."""
+        nonlocal done_count
+        done_count += 1
+        line = [f"[{done_count}/{total}]", f"#{article.get('seq', '?')}"]
+
+        if future is None and cached is None:
+            line += ["FAILED", "stage=download", f"url={article['url']}"]
             article["status"] = "failed"
             article["errors"] = article.get("errors", []) + ["download failed"]
             stats["failed"] += 1
-            save_manifest(articles, output_dir)
-            continue
-
-        # Extract
-        try:
-            result = extract_article(
-                raw_html, str(articles_dir),
-                seq=seq, download_img=download_images, session=img_session,
-            )
-            article["status"] = "extracted"
-            article["title"] = result.get("title", article.get("title", ""))
-            article["dir_name"] = result.get("dir_name", "")
-            article["author"] = result.get("author", "")
-            article["publish_time"] = result.get("publish_time", "")
-            if result.get("errors"):
-                article["errors"] = result["errors"]
-            if result.get("img_stats"):
-                s = result["img_stats"]
-                print(f"  OK — {result['title'][:40]} | images: {s['ok']}/{s['total']}, "
-                      f"failed: {s['failed']}, {s['bytes']} bytes")
-            else:
-                print(f"  OK — {result['title'][:40]}")
-            stats["ok"] += 1
-        except Exception as e:
-            print(f"  FAILED extraction: {e}")
-            article["status"] = "failed"
-            article["errors"] = article.get("errors", []) + [str(e)]
-            stats["failed"] += 1
-
-        # Save manifest after each article (checkpoint)
-        save_manifest(articles, output_dir)
-
-        # Random delay (skip after last article)
-        if idx < total - 1:
-            delay = random.uniform(delay_min, delay_max)
-            print(f"  Waiting {delay:.1f}s...")
-            time.sleep(delay)
+            failed.append(article)
+        else:
+            try:
+                result = cached if cached is not None else future.result()
+                article["status"] = "extracted"
+                article["title"] = result.get("title", article.get("title", ""))
+                article["dir_name"] = result.get("dir_name", "")
+                article["author"] = result.get("author", "")
+                article["publish_time"] = result.get("publish_time", "")
+                if result.get("errors"):
+                    article["errors"] = result["errors"]
+                line.append("OK")
+                if cached is not None:
+                    line.append("cached")
+                line.append(f"title={result['title'][:40]}")
+                if result.get("img_stats"):
+                    s = result["img_stats"]
+                    line += [f"images={s['ok']}/{s['total']}",
+                             f"img_failed={s['failed']}", f"bytes={s['bytes']}"]
+                stats["ok"] += 1
+                if cached is None and digest:
+                    store_cached_result(output_dir, digest, article.get("seq", 0),
+                                        download_images, result)
+            except Exception as e:
+                line += ["FAILED", "stage=extract", f"error={e}"]
+                article["status"] = "failed"
+                article["errors"] = article.get("errors", []) + [str(e)]
+                stats["failed"] += 1
+                failed.append(article)
+
+        line.append(f"took={time.time() - started:.1f}s")
+        out.write(" ".join(line) + "\n")
+        if done_count % LOG_FLUSH_EVERY == 0:
+            out.flush()
+        checkpoint.record(article)
+
+    pending = {}  # extraction future -> (article, fetch start, html digest, html ref)
+    blocks = HtmlBlocks()
+    try:
+        # Never fork workers from this process: the CDP reader and tab threads
+        # are already running, and a forked child could inherit a lock one of
+        # them holds. forkserver forks from a clean single-threaded server.
+        start_method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                        else "spawn")
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 mp_context=multiprocessing.get_context(start_method),
+                                 initializer=_init_extract_worker,
+                                 initargs=(max(1, IMG_DOWNLOADS // n_workers),)) as pool:
+            for idx in range(total):
+                article, raw_html, started = results.get()
+                if raw_html is None:
+                    finish(article, started)
+                    continue
+
+                # Identical HTML already extracted into the same slot: reuse it
+                seq = article.get("seq", idx + 1)
+                data = raw_html.encode("utf-8", "replace")
+                digest = hashlib.sha256(data).hexdigest()
+                cached = load_cached_result(output_dir, digest, seq, download_images)
+                if cached is not None:
+                    finish(article, started, digest=digest, cached=cached)
+                    continue
+
+                html_ref = blocks.put(data) or raw_html
+                future = pool.submit(_extract_in_worker, html_ref,
+                                     str(articles_dir), seq, download_images)
+                pending[future] = (article, started, digest, html_ref)
+
+                # Keep at most one queued extraction per worker
+                if len(pending) >= n_workers:
+                    completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in completed:
+                        article, started, digest, html_ref = pending.pop(f)
+                        blocks.release(html_ref)
+                        finish(article, started, f, digest)
+
+            for f in as_completed(pending):
+                article, started, digest, _ = pending[f]
+                finish(article, started, f, digest)
+            pending.clear()
+    finally:
+        out.flush()
+        checkpoint.flush()
+        blocks.close()
+        # Don't leave our tabs in the user's Chrome on Ctrl+C / SIGTERM
+        for tab in tabs:
+            tab.close()
+        cdp.close()
 
     elapsed = time.time() - start_time
     print(f"\n{'=' * 60}")
@@ -382,7 +714,6 @@ def cmd_crawl(args):
     print(f"  Manifest: {output_dir / 'manifest.json'}")
 
     # Report failures
-    failed = [a for a in articles if a.get("status") == "failed"]
     if failed:
         print(f"\nFailed articles ({len(failed)}):")
         for a in failed:
@@ -404,11 +735,14 @@ def cmd_stats(args):
         print(f"No manifest found at {manifest_path}")
         return
 
+    # Status tally and error list in one pass over the manifest
     total = len(articles)
-    by_status = {}
+    by_status = Counter()
+    with_errors = []
     for a in articles:
-        s = a.get("status", "unknown")
-        by_status[s] = by_status.get(s, 0) + 1
+        by_status[a.get("status", "unknown")] += 1
+        if a.get("errors"):
+            with_errors.append(a)
 
     print(f"Manifest: {manifest_path}")
     print(f"Total articles: {total}")
@@ -418,7 +752,6 @@ def cmd_stats(args):
         print(f"  {status}: {count} ({pct:.0f}%)")
 
     # Articles with errors
-    with_errors = [a for a in articles if a.get("errors")]
     if with_errors:
         print(f"\nArticles with errors: {len(with_errors)}")
         for a in with_errors[:10]:
@@ -430,12 +763,9 @@ def cmd_stats(args):
 
     # Disk usage
     if articles_dir.exists():
-        total_size = sum(
-            f.stat().st_size
-            for f in articles_dir.rglob("*")
-            if f.is_file()
-        )
-        dir_count = sum(1 for d in articles_dir.iterdir() if d.is_dir())
+        total_size = tree_size(articles_dir)
+        with os.scandir(articles_dir) as it:
+            dir_count = sum(1 for e in it if e.is_dir(follow_symlinks=False))
         print(f"\nDisk usage: {total_size / 1024 / 1024:.1f} MB")
         print(f"Article directories: {dir_count}")
 
@@ -508,6 +838,14 @@ def main():
         "--delay", default=DEFAULT_DELAY,
         help=f"Delay between articles in seconds, e.g. '2-5' or '3' (default: {DEFAULT_DELAY})",
     )
+    p_crawl.add_argument(
+        "--tabs", type=int, default=DEFAULT_TABS,
+        help=f"Chrome tabs fetching in parallel (default: {DEFAULT_TABS})",
+    )
+    p_crawl.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Extraction processes (default: CPU count, {DEFAULT_WORKERS})",
+    )
     p_crawl.add_argument(
         "--limit", type=int, default=0,
         help="Max articles to process (0 = all)",
@@ -548,6 +886,14 @@ def main():
         "--delay", default=DEFAULT_DELAY,
         help=f"Delay between articles (default: {DEFAULT_DELAY})",
     )
+    p_retry.add_argument(
+        "--tabs", type=int, default=DEFAULT_TABS,
+        help=f"Chrome tabs fetching in parallel (default: {DEFAULT_TABS})",
+    )
+    p_retry.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Extraction processes (default: CPU count, {DEFAULT_WORKERS})",
+    )
     p_retry.add_argument(
         "--limit", type=int, default=0,
         help="Max articles to retry (0 = all)",
@@ -0,0 +1,320 @@
+"""
+Minimal Chrome DevTools Protocol client over one persistent WebSocket.
+
+Replaces spawning `node cdp_fetch.js` per URL: a single browser-level
+connection is opened once, and each tab is driven through a flattened
+target session (Target.attachToTarget with flatten=true), so all CDP
+traffic shares one socket. A background reader thread dispatches command
+responses by message id and events by (sessionId, method).
+
+Usage:
+  from cdp_client import CDPClient
+  client = CDPClient(browser_ws_url)   # from /json/version webSocketDebuggerUrl
+  tab = client.open_tab()
+  html = tab.fetch_html("https://mp.weixin.qq.com/s/xxx")
+  client.close()
+"""
+
+import http.client
+import itertools
+import json
+import threading
+import time
+
+import websocket
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+CONNECT_TIMEOUT = 5     # seconds to open the WebSocket
+COMMAND_TIMEOUT = 30    # seconds to wait for a command response
+LOAD_TIMEOUT = 30       # seconds to wait for Page.loadEventFired
+SETTLE_DELAY = 1.5      # seconds for page JS to populate content after load
+
+# Existing tabs that may be reused instead of opening a new one
+REUSABLE_TAB_URLS = ("about:blank", "https://mp.weixin.qq.com")
+
+# Subresources that are not needed to read article HTML (--no-images)
+BLOCKED_RESOURCE_TYPES = ("Image", "Stylesheet", "Font", "Media")
+
+
+class CDPError(Exception):
+    """Chrome returned a protocol error, or the connection was lost."""
+
+
+def get_browser_info(cdp_port: str, timeout: float = CONNECT_TIMEOUT) -> dict:
+    """
+    Return Chrome's /json/version info (Browser, webSocketDebuggerUrl, ...).
+
+    Plain http.client against localhost; raises OSError if nothing listens.
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", int(cdp_port), timeout=timeout)
+    try:
+        conn.request("GET", "/json/version")
+        resp = conn.getresponse()
+        body = resp.read()
+        if resp.status != 200:
+            raise CDPError(f"/json/version returned HTTP {resp.status}")
+        return json.loads(body)
+    finally:
+        conn.close()
+
+
+class _Waiter:
+    """One-shot slot filled by the reader thread."""
+
+    __slots__ = ("_event", "value")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+        self._event.set()
+
+    def wait(self, timeout: float):
+        if not self._event.wait(timeout):
+            raise TimeoutError(f"no reply within {timeout}s")
+        return self.value
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+class CDPClient:
+    """A browser-level CDP connection shared by any number of tabs."""
+
+    def __init__(self, ws_url: str):
+        # Chrome rejects DevTools WebSockets that carry an Origin header
+        # unless launched with --remote-allow-origins.
+        self._ws = websocket.create_connection(
+            ws_url, timeout=CONNECT_TIMEOUT, suppress_origin=True,
+            enable_multithread=True,
+        )
+        self._ws.settimeout(None)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending: dict[int, _Waiter] = {}
+        self._event_waiters: dict[tuple[str, str], list[_Waiter]] = {}
+        self._handlers: dict[tuple[str, str], callable] = {}
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self):
+        try:
+            while True:
+                raw = self._ws.recv()
+                if not raw:
+                    break
+                msg = json.loads(raw)
+                if "id" in msg:
+                    with self._lock:
+                        waiter = self._pending.pop(msg["id"], None)
+                    if waiter:
+                        waiter.set(msg)
+                elif "method" in msg:
+                    key = (msg.get("sessionId", ""), msg["method"])
+                    with self._lock:
+                        waiters = self._event_waiters.pop(key, [])
+                        handler = self._handlers.get(key)
+                    for w in waiters:
+                        w.set(msg.get("params", {}))
+                    if handler:
+                        handler(msg.get("params", {}))
+        except (websocket.WebSocketException, OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._closed = True
+                stranded = list(self._pending.values())
+                for waiters in self._event_waiters.values():
+                    stranded.extend(waiters)
+                self._pending.clear()
+                self._event_waiters.clear()
+            # Wake every blocked caller; a None reply means "connection lost"
+            for w in stranded:
+                w.set(None)
+
+    def post(self, method: str, params: dict = None, session_id: str = ""):
+        """
+        Send a command without waiting for its response.
+
+        Safe to call from an event handler on the reader thread, where a
+        blocking send() would deadlock waiting on itself.
+        """
+        msg = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        try:
+            self._ws.send(json.dumps(msg))
+        except (websocket.WebSocketException, OSError):
+            pass
+
+    def send(self, method: str, params: dict = None, session_id: str = "",
+             timeout: float = COMMAND_TIMEOUT) -> dict:
+        """Send a command and block until its response arrives."""
+        msg_id = next(self._ids)
+        msg = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        waiter = _Waiter()
+        with self._lock:
+            if self._closed:
+                raise CDPError("CDP connection closed")
+            self._pending[msg_id] = waiter
+        self._ws.send(json.dumps(msg))
+
+        try:
+            resp = waiter.wait(timeout)
+        except TimeoutError:
+            with self._lock:
+                self._pending.pop(msg_id, None)
+            raise TimeoutError(f"{method} timed out after {timeout}s")
+        if resp is None:
+            raise CDPError("CDP connection closed")
+        if "error" in resp:
+            raise CDPError(f"{method}: {resp['error'].get('message', resp['error'])}")
+        return resp.get("result", {})
+
+    def expect(self, method: str, session_id: str = "") -> _Waiter:
+        """Register interest in the next `method` event before triggering it."""
+        waiter = _Waiter()
+        with self._lock:
+            if self._closed:
+                raise CDPError("CDP connection closed")
+            self._event_waiters.setdefault((session_id, method), []).append(waiter)
+        return waiter
+
+    def forget(self, waiter: _Waiter, method: str, session_id: str = ""):
+        """Drop an expect() waiter whose event never arrived."""
+        key = (session_id, method)
+        with self._lock:
+            waiters = self._event_waiters.get(key)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._event_waiters[key]
+
+    def on(self, method: str, handler, session_id: str = ""):
+        """
+        Call handler(params) for every `method` event, on the reader thread.
+
+        Handlers must not block; use post() to answer events.
+        """
+        with self._lock:
+            self._handlers[(session_id, method)] = handler
+
+    def open_tab(self, reuse: tuple[str, ...] = REUSABLE_TAB_URLS) -> "Tab":
+        """Attach to a reusable page target (or create one) and return a Tab."""
+        target_id = ""
+        created = False
+        if reuse:
+            targets = self.send("Target.getTargets").get("targetInfos", [])
+            for t in targets:
+                if t.get("type") == "page" and not t.get("attached") \
+                        and t.get("url", "").startswith(reuse):
+                    target_id = t["targetId"]
+                    break
+        if not target_id:
+            target_id = self.send(
+                "Target.createTarget", {"url": "about:blank"}
+            )["targetId"]
+            created = True
+
+        session_id = self.send(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        )["sessionId"]
+        tab = Tab(self, target_id, session_id, created)
+        tab.send("Page.enable")
+        return tab
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        try:
+            self._ws.close()
+        except (websocket.WebSocketException, OSError):
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Tab
+# ---------------------------------------------------------------------------
+
+class Tab:
+    """A page target attached through a flattened session on a CDPClient."""
+
+    def __init__(self, client: CDPClient, target_id: str, session_id: str,
+                 created: bool = False):
+        self.client = client
+        self.target_id = target_id
+        self.session_id = session_id
+        self.created = created
+
+    def send(self, method: str, params: dict = None,
+             timeout: float = COMMAND_TIMEOUT) -> dict:
+        return self.client.send(method, params, self.session_id, timeout)
+
+    def fetch_html(self, url: str, load_timeout: float = LOAD_TIMEOUT,
+                   settle: float = SETTLE_DELAY) -> str:
+        """Navigate to url, wait for load, and return document outerHTML."""
+        loaded = self.client.expect("Page.loadEventFired", self.session_id)
+        try:
+            nav = self.send("Page.navigate", {"url": url})
+            if nav.get("errorText"):
+                raise CDPError(f"navigate failed: {nav['errorText']}")
+            try:
+                loaded.wait(load_timeout)
+            except TimeoutError:
+                # Same as cdp_fetch.js: take whatever has rendered so far
+                pass
+        finally:
+            # A load that never fired must not leave its waiter queued for
+            # the next navigation on this session
+            self.client.forget(loaded, "Page.loadEventFired", self.session_id)
+        if loaded.value is None and self.client.closed:
+            raise CDPError("CDP connection closed")
+
+        # Brief wait for page JS to populate content
+        time.sleep(settle)
+
+        result = self.send("Runtime.evaluate", {
+            "expression": "document.documentElement.outerHTML",
+            "returnByValue": True,
+        })
+        return result.get("result", {}).get("value") or ""
+
+    def block_resources(self, types: tuple[str, ...] = BLOCKED_RESOURCE_TYPES):
+        """
+        Fail requests for the given resource types before they hit the network.
+
+        Only matching requests are paused (Fetch.enable patterns), so every
+        Fetch.requestPaused this tab sees is answered with BlockedByClient.
+        """
+        def on_paused(params):
+            self.client.post("Fetch.failRequest", {
+                "requestId": params["requestId"],
+                "errorReason": "BlockedByClient",
+            }, self.session_id)
+
+        self.client.on("Fetch.requestPaused", on_paused, self.session_id)
+        self.send("Fetch.enable", {"patterns": [
+            {"urlPattern": "*", "resourceType": t, "requestStage": "Request"}
+            for t in types
+        ]})
+
+    def close(self):
+        """Close the tab if we opened it, otherwise just detach from it."""
+        try:
+            if self.created:
+                self.client.send("Target.closeTarget", {"targetId": self.target_id})
+            else:
+                self.client.send("Target.detachFromTarget", {"sessionId": self.session_id})
+        except (CDPError, TimeoutError):
+            pass
@@ -1,6 +1,9 @@
 #!/usr/bin/env node
-// cdp_fetch.js — Fetch a URL via Chrome CDP and write HTML to file
-// Usage: node cdp_fetch.js <cdp_port> <url> <output_file>
+// cdp_fetch.js — Fetch a URL via Chrome CDP and write HTML to file or stdout
+// Usage: node cdp_fetch.js <cdp_port> <url> [output_file]
+//
+// With output_file, the HTML is written there and its length printed.
+// Without it (or with "-"), the HTML itself is streamed to stdout.
 //
 // Uses the real Chrome TLS fingerprint to avoid WeChat anti-crawl detection.
 // Reuses an existing about:blank or mp.weixin tab (creates one if needed).
@@ -9,10 +12,10 @@ const fs = require("fs");
 
 const CDP_PORT = process.argv[2];
 const TARGET_URL = process.argv[3];
-const OUTPUT_FILE = process.argv[4];
+const OUTPUT_FILE = process.argv[4] === "-" ? undefined : process.argv[4];
 
-if (!CDP_PORT || !TARGET_URL || !OUTPUT_FILE) {
-  console.error("Usage: node cdp_fetch.js <port> <url> <output_file>");
+if (!CDP_PORT || !TARGET_URL) {
+  console.error("Usage: node cdp_fetch.js <port> <url> [output_file]");
   process.exit(1);
 }
 
@@ -113,12 +116,18 @@ async function main() {
   });
 
   const html = evalResult.result?.value || "";
+  ws.close();
+
+  if (!OUTPUT_FILE) {
+    // Stream HTML to the caller; exit only once the pipe has drained
+    process.stdout.write(html, () => process.exit(0));
+    return;
+  }
+
   fs.writeFileSync(OUTPUT_FILE, html, "utf-8");
 
   // Output byte count for the caller
   console.log(html.length);
-
-  ws.close();
   process.exit(0);
 }
 
@@ -0,0 +1,117 @@
+"""
+Crawl manifest persistence and output helpers shared by batch_crawl.py
+and ima_crawl.py.
+
+manifest.json holds the full article list; finished articles are appended
+to manifest.jsonl as they complete and folded back in on load, so the full
+file only needs rewriting at checkpoints.
+
+Usage:
+  from crawl_common import Checkpoint, load_manifest, save_manifest
+  articles = load_manifest(output_dir)
+  checkpoint = Checkpoint(articles, output_dir)
+  checkpoint.record(article)   # after each article
+  checkpoint.flush()           # on exit
+"""
+
+import json
+import os
+from pathlib import Path
+
+CHECKPOINT_EVERY = 20   # full manifest.json rewrite after every N articles
+JOURNAL_NAME = "manifest.jsonl"  # per-article append log between checkpoints
+
+
+def load_manifest(output_dir: Path, key: str = "url") -> list:
+    """
+    Load manifest.json from output directory, replaying any journal entries.
+
+    Journal entries update the article with the same `key` value; entries
+    for unknown articles are appended.
+    """
+    manifest_path = output_dir / "manifest.json"
+    articles = []
+    if manifest_path.exists():
+        with open(manifest_path, encoding="utf-8") as f:
+            articles = json.load(f)
+
+    journal_path = output_dir / JOURNAL_NAME
+    if journal_path.exists():
+        by_key = {a.get(key): a for a in articles}
+        with open(journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line from an interrupted write
+                    continue
+                if entry.get(key) in by_key:
+                    by_key[entry[key]].update(entry)
+                else:
+                    articles.append(entry)
+                    by_key[entry.get(key)] = entry
+    return articles
+
+
+def save_manifest(articles: list, output_dir: Path):
+    """Atomically save manifest.json to output directory and drop the journal."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / "manifest.json"
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        # json.dump streams encoder chunks into the file buffer instead of
+        # building the whole document as one string first
+        json.dump(articles, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, manifest_path)
+    (output_dir / JOURNAL_NAME).unlink(missing_ok=True)
+
+
+class Checkpoint:
+    """
+    Batched manifest persistence for a crawl loop.
+
+    Each finished article is appended as one line to manifest.jsonl; the full
+    manifest.json is rewritten only every `every` articles and on flush(),
+    so an interrupted crawl loses nothing and avoids O(N^2) rewrites.
+    """
+
+    def __init__(self, articles: list, output_dir: Path,
+                 every: int = CHECKPOINT_EVERY):
+        self.articles = articles
+        self.output_dir = output_dir
+        self.every = every
+        self._journal = None
+        self._dirty = 0
+
+    def record(self, article: dict):
+        if self._journal is None:
+            self._journal = open(self.output_dir / JOURNAL_NAME, "a",
+                                 encoding="utf-8", buffering=1)
+        self._journal.write(json.dumps(article, ensure_ascii=False) + "\n")
+        self._dirty += 1
+        if self._dirty >= self.every:
+            self.flush()
+
+    def flush(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._dirty:
+            save_manifest(self.articles, self.output_dir)
+            self._dirty = 0
+
+
+def tree_size(root: Path) -> int:
+    """Total size of regular files under root, using os.scandir's cached entry types."""
+    total = 0
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
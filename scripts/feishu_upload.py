@@ -5,6 +5,9 @@ Credentials are loaded from (in priority order):
   1. Environment variables: FEISHU_APP_ID, FEISHU_APP_SECRET
   2. Config file: ~/.chrome-crawl/config.json  {"feishu": {"app_id": "...", "app_secret": "..."}}
 
+The tenant access token is cached in ~/.chrome-crawl/token_cache.json until
+shortly before it expires.
+
 Usage:
   # Upload a single markdown file with images
   python3 feishu_upload.py <md_file> [assets_dir]
@@ -15,21 +18,103 @@ Usage:
   result = upload_article(token, "Title", Path("article.md"), Path("assets/"))
 """
 
+import contextlib
 import json
+import mimetypes
+import mmap
 import os
 import re
 import sys
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# Import shared helpers from the same directory
+sys.path.insert(0, str(Path(__file__).parent))
+from ratelimit import TokenBucket
 
 BASE_URL = "https://open.feishu.cn/open-apis"
+UPLOAD_WORKERS = 8  # image uploads in flight at once
+MAX_CHILDREN = 30   # blocks per create-children request
+MMAP_MIN_SIZE = 1024 * 1024  # parse markdown files this large from an mmap
+
+# Client-side API rate limit, adapted to 429 responses (requests per second)
+API_RATE = 5.0
+API_BURST = 5
+API_RATE_MIN = 1.0
+API_RATE_MAX = 10.0
+THROTTLE_PAUSE = 2.0  # seconds to hold after a 429 with no reset header
+
+# Markdown line patterns used by parse_md_with_images
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+_HR_RE = re.compile(r'^[-*_]{3,}\s*$')
+_BULLET_RE = re.compile(r'^[-*+]\s+')
+_OLIST_RE = re.compile(r'^\d+\.\s+(.+)$')
+_IMG_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+_TITLE_LINE_RE = re.compile(r'#\s+(.+)')  # document title: a "# " first line
+
+# Code fence language -> Feishu code block language id (unknown: 0)
+_LANG_MAP = {
+    "python": 49, "py": 49, "javascript": 36, "js": 36,
+    "typescript": 73, "ts": 73, "bash": 7, "sh": 7, "shell": 7,
+    "json": 38, "html": 32, "css": 16, "java": 35, "go": 29,
+    "rust": 56, "sql": 62, "yaml": 78, "yml": 78, "": 0,
+}
 
 CONFIG_PATHS = [
     Path.home() / ".chrome-crawl" / "config.json",
 ]
 
+# tenant_access_token is valid for ~2h; reuse it across runs until near expiry
+TOKEN_CACHE = Path.home() / ".chrome-crawl" / "token_cache.json"
+TOKEN_MARGIN = 60  # seconds of validity a cached token must still have
+# API error codes for a revoked, invalid or expired access token
+INVALID_TOKEN_CODES = frozenset((99991663, 99991668, 99991677))
+
+
+class TokenRejected(RuntimeError):
+    """The API refused the access token; get_token(rejected=...) replaces it."""
+
+
+def _new_session() -> requests.Session:
+    """requests.Session whose keep-alive pool covers every concurrent upload."""
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=UPLOAD_WORKERS * 2)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+def _retry_after(resp: requests.Response) -> float:
+    """Seconds until the rate-limit window resets, from the 429 response headers."""
+    for header in ("x-ogw-ratelimit-reset", "Retry-After"):
+        try:
+            return max(float(resp.headers[header]), 0.0)
+        except (KeyError, ValueError):
+            pass
+    return THROTTLE_PAUSE
+
+
+# One connection pool for every Feishu API call, so the TLS handshake is
+# paid once per connection instead of once per request
+_session = _new_session()
+_bucket = TokenBucket(API_RATE, API_BURST, API_RATE_MAX, API_RATE_MIN)
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a Feishu API request through the shared session and rate limiter."""
+    _bucket.acquire()
+    resp = _session.request(method, url, **kwargs)
+    if resp.status_code == 429:
+        _bucket.throttled(_retry_after(resp))
+    elif resp.status_code < 400:
+        _bucket.succeeded()
+    return resp
+
 
 def _load_config() -> dict:
     for p in CONFIG_PATHS:
@@ -63,25 +148,82 @@ def _get_feishu_credentials() -> tuple[str, str]:
     )
 
 
-def get_token() -> str:
-    """Get Feishu tenant access token."""
+def _cached_token(app_id: str) -> str | None:
+    """Token from TOKEN_CACHE if it belongs to app_id and is not about to expire."""
+    try:
+        cache = json.loads(TOKEN_CACHE.read_text(encoding="utf-8"))
+        if cache["app_id"] == app_id and cache["expires_at"] > time.time() + TOKEN_MARGIN:
+            return cache["token"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_token(app_id: str, token: str, expire: int):
+    """Atomically write the token cache, readable by the owner only."""
+    tmp_path = TOKEN_CACHE.with_suffix(".json.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, "w", encoding="utf-8") as f:
+        json.dump({"app_id": app_id, "token": token,
+                   "expires_at": time.time() + expire}, f)
+    os.replace(tmp_path, TOKEN_CACHE)
+
+
+@contextlib.contextmanager
+def _token_lock():
+    """Hold an exclusive lock on the token cache across processes.
+
+    fcntl is POSIX-only; where it is missing (Windows) runs are not
+    serialized and may each fetch a token, which is harmless.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(TOKEN_CACHE.with_suffix(".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def get_token(rejected: str | None = None) -> str:
+    """Get Feishu tenant access token, reusing the cached one while valid.
+
+    Pass a token the API refused as `rejected`: if the cache still holds
+    it, the entry is dropped and a new token fetched (a concurrent run may
+    already have replaced it, in which case the cached one is returned).
+    """
     app_id, app_secret = _get_feishu_credentials()
-    resp = requests.post(f"{BASE_URL}/auth/v3/tenant_access_token/internal", json={
-        "app_id": app_id, "app_secret": app_secret,
-    })
-    data = resp.json()
-    if data.get("code") != 0:
-        raise RuntimeError(f"Token error: {data}")
-    return data["tenant_access_token"]
+    TOKEN_CACHE.parent.mkdir(parents=True, exist_ok=True)
+
+    # Serialize concurrent runs so only one of them asks for a new token
+    with _token_lock():
+        token = _cached_token(app_id)
+        if token and token != rejected:
+            return token
+        if token:
+            TOKEN_CACHE.unlink(missing_ok=True)
+
+        resp = _session.post(f"{BASE_URL}/auth/v3/tenant_access_token/internal", json={
+            "app_id": app_id, "app_secret": app_secret,
+        })
+        data = resp.json()
+        if data.get("code") != 0:
+            raise RuntimeError(f"Token error: {data}")
+        token = data["tenant_access_token"]
+        try:
+            _save_token(app_id, token, data.get("expire", 0))
+        except OSError:
+            pass  # caching is best-effort
+        return token
 
 
 def create_document(token: str, title: str) -> tuple[str, str]:
-    resp = requests.post(
-        f"{BASE_URL}/docx/v1/documents",
-        headers={"Authorization": f"Bearer {token}"},
-        json={"title": title, "folder_token": ""},
-    )
+    resp = api_post(token, f"{BASE_URL}/docx/v1/documents",
+                    {"title": title, "folder_token": ""})
     data = resp.json()
+    if data.get("code") in INVALID_TOKEN_CODES:
+        raise TokenRejected(f"Create doc error: {data}")
     if data.get("code") != 0:
         raise RuntimeError(f"Create doc error: {data}")
     doc = data["data"]["document"]
@@ -90,41 +232,95 @@ def create_document(token: str, title: str) -> tuple[str, str]:
 
 
 def api_post(token, url, payload, retries=3):
-    """POST with rate-limit retry."""
+    """POST with rate-limit retry (the shared TokenBucket paces the retries)."""
     for i in range(retries):
-        resp = requests.post(url, headers={"Authorization": f"Bearer {token}"}, json=payload)
+        resp = _request("POST", url, headers={"Authorization": f"Bearer {token}"},
+                        json=payload)
         if resp.status_code == 429:
-            time.sleep(2 * (i + 1))
             continue
         return resp
     return resp
 
 
-def upload_image(token: str, img_path: Path, doc_id: str, block_id: str) -> bool:
+class _MultipartFile:
+    """multipart/form-data body that streams its file part from disk.
+
+    requests builds `files=` uploads fully in memory; this file-like object
+    yields the form fields, then the open file in chunks, then the closing
+    boundary, and reports the exact total length for Content-Length.
+    """
+
+    def __init__(self, fields: dict, filename: str, f, size: int):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        quoted = filename.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+        file_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        head = "".join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'
+            for k, v in fields.items()
+        ) + (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+            f'filename="{quoted}"\r\nContent-Type: {file_type}\r\n\r\n'
+        )
+        self._parts = [head.encode("utf-8"), f, f"\r\n--{boundary}--\r\n".encode()]
+        self._len = len(self._parts[0]) + size + len(self._parts[2])
+
+    def __len__(self) -> int:
+        return self._len
+
+    def read(self, n: int = -1) -> bytes:
+        out = b""
+        while self._parts and (n < 0 or len(out) < n):
+            part = self._parts[0]
+            if isinstance(part, bytes):
+                take = len(part) if n < 0 else n - len(out)
+                out += part[:take]
+                if take >= len(part):
+                    self._parts.pop(0)
+                else:
+                    self._parts[0] = part[take:]
+            else:
+                chunk = part.read(-1 if n < 0 else n - len(out))
+                if chunk:
+                    out += chunk
+                else:
+                    self._parts.pop(0)
+        return out
+
+
+def upload_image(token: str, img_path: Path, doc_id: str, block_id: str,
+                 size: int | None = None) -> bool:
     """Upload image to a Feishu image block and link it. Returns True on success.
 
     Three-step process:
       1. Upload file to drive media (already have block from caller)
       2. PATCH block with replace_image to link the file_token
     Note: Use replace_image, NOT update_image (the latter returns invalid param).
+
+    `size` is the file size from parse_md_with_images, to avoid a re-stat.
     """
+    if size is None:
+        size = img_path.stat().st_size
+    fields = {
+        "file_name": img_path.name,
+        "parent_type": "docx_image",
+        "parent_node": block_id,
+        "size": str(size),
+    }
     for attempt in range(3):
         try:
-            # Step 1: Upload file
+            # Step 1: Upload file (streamed from disk)
             with open(img_path, "rb") as f:
-                resp = requests.post(
-                    f"{BASE_URL}/drive/v1/medias/upload_all",
-                    headers={"Authorization": f"Bearer {token}"},
-                    data={
-                        "file_name": img_path.name,
-                        "parent_type": "docx_image",
-                        "parent_node": block_id,
-                        "size": str(img_path.stat().st_size),
+                body = _MultipartFile(fields, img_path.name, f, size)
+                resp = _request(
+                    "POST", f"{BASE_URL}/drive/v1/medias/upload_all",
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "Content-Type": body.content_type,
                     },
-                    files={"file": (img_path.name, f)},
+                    data=body,
                 )
             if resp.status_code == 429:
-                time.sleep(2 * (attempt + 1))
                 continue
             data = resp.json()
             if data.get("code") != 0:
@@ -132,13 +328,12 @@ def upload_image(token: str, img_path: Path, doc_id: str, block_id: str) -> bool
             file_token = data["data"]["file_token"]
 
             # Step 2: Link token to block via replace_image
-            resp2 = requests.patch(
-                f"{BASE_URL}/docx/v1/documents/{doc_id}/blocks/{block_id}",
+            resp2 = _request(
+                "PATCH", f"{BASE_URL}/docx/v1/documents/{doc_id}/blocks/{block_id}",
                 headers={"Authorization": f"Bearer {token}"},
                 json={"replace_image": {"token": file_token}},
             )
             if resp2.status_code == 429:
-                time.sleep(2 * (attempt + 1))
                 continue
             return resp2.status_code == 200 and resp2.json().get("code") == 0
 
@@ -147,123 +342,225 @@ def upload_image(token: str, img_path: Path, doc_id: str, block_id: str) -> bool
     return False
 
 
-def parse_md_with_images(md_content: str, assets_dir: Path) -> list:
+def parse_md_with_images(md_content: str | mmap.mmap, assets_dir: Path) -> list:
     """Parse markdown into a list of (type, data) tuples.
 
-    Types: 'blocks' (list of Feishu blocks), 'image' (Path to local image file)
+    md_content may also be a read-only mmap of a UTF-8 file; its lines
+    are then decoded one at a time.
+
+    Types: 'blocks' (list of Feishu blocks),
+           'image' ((Path, size in bytes) of a local image file)
     """
     items = []
-    current_blocks = []
-    lines = md_content.split("\n")
-    i = 0
-
-    def flush():
-        nonlocal current_blocks
-        if current_blocks:
-            items.append(("blocks", current_blocks))
-            current_blocks = []
-
-    while i < len(lines):
-        line = lines[i]
-
-        if not line.strip():
-            i += 1
+    blocks = []
+    lines = _Lines(md_content)
+    assets = _AssetIndex(assets_dir)
+
+    while lines.line is not None:
+        stripped = lines.line.lstrip()
+        if not stripped:
+            lines.advance()
             continue
+        # Each line handler consumes one or more lines from the reader
+        handler = _LINE_HANDLERS.get(stripped[0], _handle_paragraph)
+        handler(lines, assets, blocks, items)
 
-        # Code block
-        if line.strip().startswith("```"):
-            lang = line.strip().lstrip("`").strip()
-            code_lines = []
-            i += 1
-            while i < len(lines) and not lines[i].strip().startswith("```"):
-                code_lines.append(lines[i])
-                i += 1
-            i += 1
-            code_text = "\n".join(code_lines)
-            if code_text.strip():
-                current_blocks.append({
-                    "block_type": 14,
-                    "code": {
-                        "style": {},
-                        "elements": [{"text_run": {"content": code_text}}],
-                        "language": _map_language(lang),
-                    }
-                })
-            continue
+    _flush_blocks(blocks, items)
+    return items
 
-        # Heading
-        m = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if m:
-            level = min(len(m.group(1)), 3)
-            text = m.group(2).strip()
-            bt = level + 2
-            key = {3: "heading1", 4: "heading2", 5: "heading3"}[bt]
-            current_blocks.append({
-                "block_type": bt,
-                key: {"style": {}, "elements": [{"text_run": {"content": text}}]},
-            })
-            i += 1
-            continue
 
-        # HR
-        if re.match(r'^[-*_]{3,}\s*$', line):
-            current_blocks.append({"block_type": 22, "divider": {}})
-            i += 1
-            continue
+class _Lines:
+    """
+    Lines of a markdown string, sliced on demand with str.find.
 
-        # Blockquote
-        if line.startswith("> "):
-            qt = line[2:].strip()
-            while i + 1 < len(lines) and lines[i + 1].startswith("> "):
-                i += 1
-                qt += "\n" + lines[i][2:].strip()
-            current_blocks.append(_text_block(f"> {qt}"))
-            i += 1
-            continue
+    `line` is the current line (None past the end) and doubles as the
+    one-line lookahead for multi-line constructs. Yields the same lines as
+    text.split("\n") without building that list. An mmap'd UTF-8 file is
+    searched for b"\n" instead and each line decoded as it is reached.
+    """
 
-        # Bullet list
-        if re.match(r'^[-*+]\s+', line):
-            text = re.sub(r'^[-*+]\s+', '', line).strip()
-            current_blocks.append({
-                "block_type": 16,
-                "bullet": {"style": {}, "elements": [{"text_run": {"content": text}}]},
-            })
-            i += 1
-            continue
+    __slots__ = ("_text", "_nl", "_next", "line")
+
+    def __init__(self, text: str | mmap.mmap):
+        self._text = text
+        self._nl = "\n" if isinstance(text, str) else b"\n"
+        self._next = 0
+        self.line = None
+        self.advance()
+
+    def advance(self):
+        pos = self._next
+        if pos > len(self._text):
+            self.line = None
+            return
+        nl = self._text.find(self._nl, pos)
+        if nl < 0:
+            nl = len(self._text)
+        line = self._text[pos:nl]
+        self.line = line if isinstance(line, str) else line.decode("utf-8")
+        self._next = nl + 1
+
+
+class _AssetIndex:
+    """
+    Resolves markdown image paths against assets_dir.
 
-        # Ordered list
-        m = re.match(r'^\d+\.\s+(.+)$', line)
-        if m:
-            text = m.group(1).strip()
-            current_blocks.append({
-                "block_type": 17,
-                "ordered": {"style": {}, "elements": [{"text_run": {"content": text}}]},
-            })
-            i += 1
-            continue
+    Each directory an image points into is listed once with os.scandir, so
+    per image it is a dict lookup plus the DirEntry's cached stat instead
+    of building Paths and calling exists() and stat() on them.
+    """
 
-        # Image
-        m = re.match(r'!\[([^\]]*)\]\(([^)]+)\)', line)
-        if m:
-            src = m.group(2)
-            # Check if it's a local image
-            local_path = assets_dir / src if not os.path.isabs(src) else Path(src)
-            if not local_path.exists() and src.startswith("assets/"):
-                local_path = assets_dir.parent / src
-            if local_path.exists() and local_path.stat().st_size > 0:
-                flush()
-                items.append(("image", local_path))
-            else:
-                current_blocks.append(_text_block(f"[{m.group(1) or 'image'}]"))
-            i += 1
-            continue
+    __slots__ = ("assets_dir", "_dirs")
 
-        # Regular paragraph
-        current_blocks.append(_text_block(line))
-        i += 1
+    def __init__(self, assets_dir: Path):
+        self.assets_dir = assets_dir
+        self._dirs: dict[str, dict[str, os.DirEntry]] = {}
 
-    flush()
-    return items
+    def _entries(self, directory: str) -> dict:
+        entries = self._dirs.get(directory)
+        if entries is None:
+            try:
+                with os.scandir(directory) as it:
+                    entries = {e.name: e for e in it}
+            except OSError:
+                entries = {}
+            self._dirs[directory] = entries
+        return entries
+
+    def resolve(self, src: str) -> tuple[Path, int]:
+        """(path, size in bytes) of a local image file; size is 0 if there is none."""
+        # Relative to assets_dir, or to its parent for "assets/..." links
+        bases = [self.assets_dir]
+        if src.startswith("assets/"):
+            bases.append(self.assets_dir.parent)
+        for base in bases:
+            path = os.path.join(base, src)  # an absolute src ignores base
+            directory, name = os.path.split(path)
+            entry = self._entries(directory).get(name)
+            if entry is not None and entry.is_file():
+                try:
+                    return Path(path), entry.stat().st_size
+                except OSError:
+                    break
+        return Path(path), 0
+
+
+def _flush_blocks(blocks: list, items: list):
+    """Move pending text blocks into items (before an image item)."""
+    if blocks:
+        items.append(("blocks", blocks[:]))
+        blocks.clear()
+
+
+def _handle_paragraph(lines, assets, blocks, items):
+    blocks.append(_text_block(lines.line))
+    lines.advance()
+
+
+def _handle_code_fence(lines, assets, blocks, items):
+    line = lines.line
+    if not line.strip().startswith("```"):
+        return _handle_paragraph(lines, assets, blocks, items)
+    lang = line.strip().lstrip("`").strip()
+    code_lines = []
+    lines.advance()
+    while lines.line is not None and not lines.line.strip().startswith("```"):
+        code_lines.append(lines.line)
+        lines.advance()
+    lines.advance()
+    code_text = "\n".join(code_lines)
+    if code_text.strip():
+        blocks.append({
+            "block_type": 14,
+            "code": {
+                "style": {},
+                "elements": [{"text_run": {"content": code_text}}],
+                "language": _map_language(lang),
+            }
+        })
+
+
+def _handle_heading(lines, assets, blocks, items):
+    m = _HEADING_RE.match(lines.line)
+    if not m:
+        return _handle_paragraph(lines, assets, blocks, items)
+    level = min(len(m.group(1)), 3)
+    text = m.group(2).strip()
+    bt = level + 2
+    key = {3: "heading1", 4: "heading2", 5: "heading3"}[bt]
+    blocks.append({
+        "block_type": bt,
+        key: {"style": {}, "elements": [{"text_run": {"content": text}}]},
+    })
+    lines.advance()
+
+
+def _handle_rule_or_bullet(lines, assets, blocks, items):
+    """'-', '*', '_' and '+' lines: horizontal rule first, then bullet item."""
+    line = lines.line
+    if _HR_RE.match(line):
+        blocks.append({"block_type": 22, "divider": {}})
+        lines.advance()
+        return
+    m = _BULLET_RE.match(line)
+    if not m:
+        return _handle_paragraph(lines, assets, blocks, items)
+    blocks.append({
+        "block_type": 16,
+        "bullet": {"style": {}, "elements": [{"text_run": {"content": line[m.end():].strip()}}]},
+    })
+    lines.advance()
+
+
+def _handle_quote(lines, assets, blocks, items):
+    if not lines.line.startswith("> "):
+        return _handle_paragraph(lines, assets, blocks, items)
+    qt = lines.line[2:].strip()
+    lines.advance()
+    while lines.line is not None and lines.line.startswith("> "):
+        qt += "\n" + lines.line[2:].strip()
+        lines.advance()
+    blocks.append(_text_block(f"> {qt}"))
+
+
+def _handle_ordered(lines, assets, blocks, items):
+    m = _OLIST_RE.match(lines.line)
+    if not m:
+        return _handle_paragraph(lines, assets, blocks, items)
+    blocks.append({
+        "block_type": 17,
+        "ordered": {"style": {}, "elements": [{"text_run": {"content": m.group(1).strip()}}]},
+    })
+    lines.advance()
+
+
+def _handle_image(lines, assets, blocks, items):
+    m = _IMG_RE.match(lines.line)
+    if not m:
+        return _handle_paragraph(lines, assets, blocks, items)
+    # Check if it's a local image
+    local_path, size = assets.resolve(m.group(2))
+    if size > 0:
+        _flush_blocks(blocks, items)
+        items.append(("image", (local_path, size)))
+    else:
+        blocks.append(_text_block(f"[{m.group(1) or 'image'}]"))
+    lines.advance()
+
+
+# First non-blank character of a line -> handler; anything else is a paragraph.
+# Handlers fall back to a paragraph when the full pattern does not match.
+_LINE_HANDLERS = {
+    "`": _handle_code_fence,
+    "#": _handle_heading,
+    "-": _handle_rule_or_bullet,
+    "*": _handle_rule_or_bullet,
+    "_": _handle_rule_or_bullet,
+    "+": _handle_rule_or_bullet,
+    ">": _handle_quote,
+    "!": _handle_image,
+    **dict.fromkeys("0123456789", _handle_ordered),
+}
 
 
 def _text_block(text: str) -> dict:
@@ -274,75 +571,112 @@ def _text_block(text: str) -> dict:
 
 
 def _map_language(lang: str) -> int:
-    m = {
-        "python": 49, "py": 49, "javascript": 36, "js": 36,
-        "typescript": 73, "ts": 73, "bash": 7, "sh": 7, "shell": 7,
-        "json": 38, "html": 32, "css": 16, "java": 35, "go": 29,
-        "rust": 56, "sql": 62, "yaml": 78, "yml": 78, "": 0,
-    }
-    return m.get(lang.lower(), 0)
+    code = _LANG_MAP.get(lang)
+    if code is None:
+        code = _LANG_MAP.get(lang.lower(), 0)
+    return code
 
 
 def write_items(token: str, doc_id: str, items: list) -> dict:
-    """Write text blocks and images to document."""
+    """Write text blocks and images to document.
+
+    Text blocks and empty image placeholders are appended in markdown order,
+    MAX_CHILDREN per request; the image uploads into the returned placeholder
+    blocks are independent and run concurrently in a thread pool.
+    """
     stats = {"blocks_ok": 0, "blocks_total": 0, "imgs_ok": 0, "imgs_total": 0}
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+        uploads = _write_blocks(token, doc_id, items, stats, pool)
+        stats["imgs_ok"] = sum(1 for f in uploads if f.result())
+    return stats
+
 
+def _linear_blocks(items: list, stats: dict) -> list:
+    """Flatten parsed items into (block, image or None) in document order."""
+    linear = []
     for item_type, data in items:
-        if item_type == "blocks":
-            stats["blocks_total"] += len(data)
-            # Write in batches of 30
-            for bi in range(0, len(data), 30):
-                batch = data[bi:bi + 30]
-                resp = api_post(token,
-                    f"{BASE_URL}/docx/v1/documents/{doc_id}/blocks/{doc_id}/children",
-                    {"children": batch, "index": -1})
-
-                if resp.status_code == 200 and resp.json().get("code") == 0:
-                    stats["blocks_ok"] += len(batch)
-                else:
-                    # One by one fallback
-                    for block in batch:
-                        r = api_post(token,
-                            f"{BASE_URL}/docx/v1/documents/{doc_id}/blocks/{doc_id}/children",
-                            {"children": [block], "index": -1})
-                        if r.status_code == 200 and r.json().get("code") == 0:
-                            stats["blocks_ok"] += 1
-                        time.sleep(0.3)
-                time.sleep(0.5)
-
-        elif item_type == "image":
-            img_path = data
+        if item_type == "image":
             stats["imgs_total"] += 1
+            linear.append(({"block_type": 27, "image": {}}, data))
+        else:
+            stats["blocks_total"] += len(data)
+            linear.extend((block, None) for block in data)
+    return linear
 
-            # Step 1: create empty image block
-            resp = api_post(token,
-                f"{BASE_URL}/docx/v1/documents/{doc_id}/blocks/{doc_id}/children",
-                {"children": [{"block_type": 27, "image": {}}], "index": -1})
 
-            if resp.status_code != 200 or resp.json().get("code") != 0:
-                continue
+def _write_blocks(token: str, doc_id: str, items: list, stats: dict,
+                  pool: ThreadPoolExecutor) -> list:
+    """Append blocks in order, submitting image uploads to pool; returns their futures."""
+    url = f"{BASE_URL}/docx/v1/documents/{doc_id}/blocks/{doc_id}/children"
+    uploads = []
 
-            block_id = resp.json()["data"]["children"][0]["block_id"]
+    def created(entries: list, children: list):
+        for (block, image), child in zip(entries, children):
+            if image is None:
+                stats["blocks_ok"] += 1
+            else:
+                img_path, size = image
+                uploads.append(pool.submit(
+                    upload_image, token, img_path, doc_id, child["block_id"], size))
 
-            # Step 2: upload image and link to block
-            ok = upload_image(token, img_path, doc_id, block_id)
-            if ok:
-                stats["imgs_ok"] += 1
-            time.sleep(0.5)
+    linear = _linear_blocks(items, stats)
+    for bi in range(0, len(linear), MAX_CHILDREN):
+        page = linear[bi:bi + MAX_CHILDREN]
+        resp = api_post(token, url,
+                        {"children": [block for block, _ in page], "index": -1})
 
-    return stats
+        if resp.status_code == 200 and resp.json().get("code") == 0:
+            created(page, resp.json()["data"]["children"])
+        else:
+            # One by one fallback
+            for entry in page:
+                r = api_post(token, url, {"children": [entry[0]], "index": -1})
+                if r.status_code == 200 and r.json().get("code") == 0:
+                    created([entry], r.json()["data"]["children"])
 
+    return uploads
 
-def upload_article(token: str, title: str, md_path: Path, assets_dir: Path) -> dict:
+
+def _md_title(md_content: str | mmap.mmap) -> str | None:
+    """Text of a "# " heading on the first line, or None."""
+    m = _TITLE_LINE_RE.fullmatch(_Lines(md_content).line or "")
+    return m.group(1).strip() if m else None
+
+
+def upload_article(token: str, title: str | None, md_path: Path, assets_dir: Path,
+                   md_content: str | None = None) -> dict:
     """Upload a markdown article with images to Feishu.
 
-    Returns: {doc_id, url, blocks_ok, blocks_total, imgs_ok, imgs_total}
+    Pass md_content if the caller already has the file's text, so it is
+    not read and decoded a second time. Files of MMAP_MIN_SIZE or more are
+    parsed straight from an mmap rather than decoded into one string.
+    With title None, the document is named after a "# " heading on the
+    first line, else after md_path's stem.
+
+    A token the API rejects (e.g. revoked after a credential rotation) is
+    dropped from the token cache and replaced once.
+
+    Returns: {doc_id, url, title, blocks_ok, blocks_total, imgs_ok, imgs_total}
     """
-    doc_id, url = create_document(token, title)
-    md_content = md_path.read_text(encoding="utf-8")
-    items = parse_md_with_images(md_content, assets_dir)
+    with contextlib.ExitStack() as stack:
+        if md_content is None:
+            if md_path.stat().st_size >= MMAP_MIN_SIZE:
+                f = stack.enter_context(open(md_path, "rb"))
+                md_content = stack.enter_context(
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                md_content = md_path.read_text(encoding="utf-8")
+        if title is None:
+            title = _md_title(md_content) or md_path.stem
+
+        try:
+            doc_id, url = create_document(token, title)
+        except TokenRejected:
+            token = get_token(rejected=token)
+            doc_id, url = create_document(token, title)
+        items = parse_md_with_images(md_content, assets_dir)
     stats = write_items(token, doc_id, items)
-    return {"doc_id": doc_id, "url": url, **stats}
+    return {"doc_id": doc_id, "url": url, "title": title, **stats}
 
 
 def main():
@@ -357,20 +691,15 @@ def main():
         sys.exit(1)
 
     assets_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else md_path.parent / "assets"
-    title = md_path.stem
-
-    # Try to extract title from first markdown heading
-    content = md_path.read_text(encoding="utf-8")
-    m = re.match(r'^#\s+(.+)$', content, re.MULTILINE)
-    if m:
-        title = m.group(1).strip()
 
     print("Getting Feishu token...")
     token = get_token()
-    print(f"Uploading: {title}")
+    print(f"Uploading: {md_path}")
 
-    result = upload_article(token, title, md_path, assets_dir)
-    print(f"OK — {result['url']}")
+    # Title comes from the first-line "# " heading (else the file name);
+    # upload_article reads the file once for it and the body
+    result = upload_article(token, None, md_path, assets_dir)
+    print(f"OK — {result['title']}: {result['url']}")
     print(f"     blocks: {result['blocks_ok']}/{result['blocks_total']}, "
           f"images: {result['imgs_ok']}/{result['imgs_total']}")
 
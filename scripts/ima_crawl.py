@@ -29,18 +29,24 @@ Or pass via --share-id=<id>.
 import argparse
 import json
 import os
+import queue
 import random
 import re
-import subprocess
+import signal
 import sys
+import threading
 import time
+from collections import Counter
 from pathlib import Path
 
 import requests
 
 # Import the extraction module from the same directory
 sys.path.insert(0, str(Path(__file__).parent))
-from wechat_extract import extract_article, safe_dirname
+from cdp_client import CDPClient, Tab, get_browser_info
+from crawl_common import Checkpoint, load_manifest, save_manifest, tree_size
+from ratelimit import TokenBucket
+from wechat_extract import extract_article, new_image_session, safe_dirname
 
 # ---------------------------------------------------------------------------
 # Config
@@ -50,14 +56,17 @@ DEFAULT_OUTPUT_DIR = Path.home() / ".chrome-crawl" / "ima_kb"
 
 IMA_API_URL = "https://ima.qq.com/cgi-bin/knowledge_share_get/get_share_info"
 PAGE_LIMIT = 50  # articles per API page
+LIST_RATE = 2.0      # list API requests per second, halved on each 429
+LIST_BURST = 2
+LIST_RATE_MIN = 0.2
 
 # CDP settings
-CDP_FETCH_SCRIPT = Path(__file__).parent / "cdp_fetch.js"
 CDP_PORT_FILES = [
     Path.home() / ".chrome-crawl" / "cdp-port",
     Path.home() / ".openclaw" / "chrome-debug-port",
 ]
-CDP_TMP_FILE = Path("/tmp/ima_cdp_fetch.html")
+
+DEFAULT_TABS = 3  # Chrome tabs fetching articles in parallel
 
 # Anti-crawl settings (relaxed for CDP mode — real browser fingerprint)
 DELAY_MIN = 2.0
@@ -67,6 +76,11 @@ PAUSE_DURATION = 20     # seconds
 BACKOFF_BASE = 5        # seconds (exponential: 5, 15, 45)
 MAX_RETRIES = 3
 RATE_LIMIT_PAUSE = 60   # seconds on anti-crawl page
+ANTI_CRAWL_MARKER = "环境异常"  # text of the WeChat anti-crawl block page
+ANTI_CRAWL_SCAN = 3000  # chars of HTML to scan for the marker
+
+# Full manifest.json rewrite after every N articles (see crawl_common)
+CHECKPOINT_EVERY = 25
 
 
 def _load_config() -> dict:
@@ -98,28 +112,54 @@ def _get_share_id(cli_share_id: str = None) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Manifest management
+# Phase 1: Fetch article list from IMA API
 # ---------------------------------------------------------------------------
 
-def load_manifest(base_dir: Path) -> list:
-    manifest_path = base_dir / "manifest.json"
-    if manifest_path.exists():
-        return json.loads(manifest_path.read_text(encoding="utf-8"))
-    return []
-
+def _fetch_list_page(session: requests.Session, bucket: TokenBucket,
+                     payload: dict, page: int) -> dict | None:
+    """
+    POST one list page through the rate limiter; None once retries run out.
 
-def save_manifest(articles: list, base_dir: Path):
-    manifest_path = base_dir / "manifest.json"
-    manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    manifest_path.write_text(
-        json.dumps(articles, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    Pages go out back-to-back while the API is happy. Only transient
+    failures are retried: a 429, a 5xx or a network error slows the bucket
+    down and holds it for Retry-After, else for an exponential BACKOFF_BASE
+    delay. Other HTTP errors and API error codes fail the page at once.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        pause = BACKOFF_BASE * (2 ** attempt)
+        bucket.acquire()
+        try:
+            resp = session.post(IMA_API_URL, json=payload, timeout=30)
+        except requests.RequestException as e:
+            problem = f"ERROR on page {page}: {e}"
+        else:
+            if resp.status_code == 429:
+                problem = "Rate limited (HTTP 429)"
+                try:
+                    pause = max(float(resp.headers["Retry-After"]), 0.0)
+                except (KeyError, ValueError):
+                    pass
+            elif resp.status_code >= 500:
+                problem = f"Server error (HTTP {resp.status_code})"
+            else:
+                try:
+                    resp.raise_for_status()
+                    data = resp.json()
+                except (requests.HTTPError, ValueError) as e:
+                    print(f"  ERROR on page {page}: {e}")
+                    return None
+                if data.get("code", -1) == 0:
+                    bucket.succeeded()
+                    return data
+                print(f"  API error: code={data.get('code')}, msg={data.get('msg')}")
+                return None
 
+        print(f"  {problem}")
+        if attempt < MAX_RETRIES:
+            print(f"  Retrying in {pause:g}s...")
+            bucket.throttled(pause)
+    return None
 
-# ---------------------------------------------------------------------------
-# Phase 1: Fetch article list from IMA API
-# ---------------------------------------------------------------------------
 
 def fetch_article_list(base_dir: Path, share_id: str,
                        headers_file: str = None, headers_json: str = None):
@@ -130,7 +170,7 @@ def fetch_article_list(base_dir: Path, share_id: str,
     elif headers_json:
         auth_headers = json.loads(headers_json)
     else:
-        existing = load_manifest(base_dir)
+        existing = load_manifest(base_dir, key="seq")
         if existing:
             print(f"Found existing manifest with {len(existing)} articles.")
             print("To refresh, provide --headers=<path> with auth headers.")
@@ -141,6 +181,7 @@ def fetch_article_list(base_dir: Path, share_id: str,
 
     session = requests.Session()
     session.headers.update(auth_headers)
+    bucket = TokenBucket(LIST_RATE, LIST_BURST, min_rate=LIST_RATE_MIN)
 
     all_articles = []
     cursor = ""
@@ -156,15 +197,8 @@ def fetch_article_list(base_dir: Path, share_id: str,
         }
 
         print(f"Fetching page {page} (cursor={cursor[:20] + '...' if cursor else 'start'})...")
-        try:
-            resp = session.post(IMA_API_URL, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            if data.get("code", -1) != 0:
-                print(f"  API error: code={data.get('code')}, msg={data.get('msg')}")
-                break
-        except Exception as e:
-            print(f"  ERROR on page {page}: {e}")
+        data = _fetch_list_page(session, bucket, payload, page)
+        if data is None:
             break
 
         knowledge_list = data.get("knowledge_list", [])
@@ -202,8 +236,6 @@ def fetch_article_list(base_dir: Path, share_id: str,
             break
         cursor = next_cursor
 
-        time.sleep(random.uniform(1, 2))
-
     # Assign sequence numbers
     for idx, a in enumerate(all_articles):
         a["seq"] = idx + 1
@@ -235,24 +267,14 @@ def get_cdp_port() -> str:
     return ""
 
 
-def download_raw_html_cdp(url: str, cdp_port: str) -> str | None:
+def download_raw_html_cdp(url: str, tab: Tab) -> str | None:
     """Download article HTML via Chrome CDP (real browser TLS fingerprint)."""
     for attempt in range(MAX_RETRIES + 1):
         try:
-            result = subprocess.run(
-                ["node", str(CDP_FETCH_SCRIPT), cdp_port, url, str(CDP_TMP_FILE)],
-                capture_output=True, text=True, timeout=50,
-            )
-            if result.returncode != 0:
-                err = result.stderr.strip()
-                print(f"    CDP attempt {attempt + 1}: {err[:80]}")
-                if attempt < MAX_RETRIES:
-                    time.sleep(BACKOFF_BASE * (2 ** attempt))
-                continue
-
-            html_text = CDP_TMP_FILE.read_text(errors="replace")
+            html_text = tab.fetch_html(url)
 
-            if "环境异常" in html_text[:3000]:
+            # Bounded search: no 3000-char slice copied per article
+            if html_text.find(ANTI_CRAWL_MARKER, 0, ANTI_CRAWL_SCAN) >= 0:
                 print(f"    Anti-crawl page via CDP, pausing {RATE_LIMIT_PAUSE}s...")
                 time.sleep(RATE_LIMIT_PAUSE)
                 continue
@@ -265,7 +287,7 @@ def download_raw_html_cdp(url: str, cdp_port: str) -> str | None:
 
             return html_text
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print(f"    CDP timeout (attempt {attempt + 1})")
             if attempt < MAX_RETRIES:
                 time.sleep(BACKOFF_BASE * (2 ** attempt))
@@ -277,9 +299,57 @@ def download_raw_html_cdp(url: str, cdp_port: str) -> str | None:
     return None
 
 
-def crawl_articles(base_dir: Path, limit: int = 0, force: bool = False):
+class FetchPacer:
+    """
+    Anti-crawl pacing shared by the tab workers.
+
+    Each tab starts a fetch a random DELAY_MIN..DELAY_MAX after the start of
+    its previous one, so the time spent fetching counts toward the delay.
+    Every PAUSE_EVERY articles all tabs stop for PAUSE_DURATION. An
+    anti-crawl page only holds the tab that hit it (inside
+    download_raw_html_cdp).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = 0
+
+    def count_article(self):
+        """Count an article; hold every worker during the periodic pause."""
+        with self._lock:
+            if self._started > 0 and self._started % PAUSE_EVERY == 0:
+                print(f"  === Pausing {PAUSE_DURATION}s after {self._started} articles ===")
+                time.sleep(PAUSE_DURATION)
+            self._started += 1
+
+    def wait_turn(self, last_start: float | None) -> float:
+        """Sleep until this tab may start its next fetch; return the start time."""
+        if last_start is not None:
+            delay = last_start + random.uniform(DELAY_MIN, DELAY_MAX) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return time.monotonic()
+
+
+def _fetch_worker(tab: Tab, work: queue.Queue, results: queue.Queue,
+                  pacer: FetchPacer):
+    """Pull articles off the work queue, fetch them on `tab`, push the HTML."""
+    started = None
+    while True:
+        try:
+            article = work.get_nowait()
+        except queue.Empty:
+            return
+        started = pacer.wait_turn(started)
+        pacer.count_article()
+        raw_html = download_raw_html_cdp(article["source_path"], tab)
+        results.put((article, raw_html))
+
+
+def crawl_articles(base_dir: Path, limit: int = 0, force: bool = False,
+                   tabs: int = DEFAULT_TABS):
     """Download and extract articles from manifest."""
-    articles = load_manifest(base_dir)
+    articles = load_manifest(base_dir, key="seq")
     if not articles:
         print("ERROR: No manifest found. Run --phase=list first.")
         sys.exit(1)
@@ -293,8 +363,8 @@ def crawl_articles(base_dir: Path, limit: int = 0, force: bool = False):
         sys.exit(1)
 
     try:
-        resp = requests.get(f"http://127.0.0.1:{cdp_port}/json/version", timeout=3)
-        resp.raise_for_status()
+        info = get_browser_info(cdp_port, timeout=3)
+        cdp = CDPClient(info["webSocketDebuggerUrl"])
         print(f"Chrome CDP ready on port {cdp_port}")
     except Exception:
         print(f"ERROR: Cannot reach Chrome CDP on port {cdp_port}")
@@ -325,61 +395,81 @@ def crawl_articles(base_dir: Path, limit: int = 0, force: bool = False):
     print(f"To process: {total}")
     if total == 0:
         print("Nothing to do!")
+        cdp.close()
         return
 
-    img_session = requests.Session()
+    # Tabs fetch concurrently on the persistent connection; extraction stays
+    # in this thread, in completion order
+    work = queue.Queue()
+    for a in to_process:
+        work.put(a)
+    n_tabs = max(1, min(tabs, total))
+    results = queue.Queue(maxsize=n_tabs)
+    pacer = FetchPacer()
+    tab_list = [cdp.open_tab() for _ in range(n_tabs)]
+    for tab in tab_list:
+        threading.Thread(
+            target=_fetch_worker, args=(tab, work, results, pacer), daemon=True,
+        ).start()
+    print(f"Fetching with {n_tabs} tab(s)")
+
+    # Shared across articles so image CDN connections stay alive
+    img_session = new_image_session()
     stats = {"ok": 0, "failed": 0}
     start_time = time.time()
 
-    for idx, article in enumerate(to_process):
-        seq = article.get("seq", idx + 1)
-        title = article.get("title", "Untitled")
-        url = article["source_path"]
-
-        print(f"\n[{idx + 1}/{total}] #{seq} {title[:40]}...")
+    # Batched manifest writes; flushed on normal exit, Ctrl+C, or SIGTERM
+    checkpoint = Checkpoint(articles, base_dir, CHECKPOINT_EVERY)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
 
-        if idx > 0 and idx % PAUSE_EVERY == 0:
-            print(f"  === Pausing {PAUSE_DURATION}s after {idx} articles ===")
-            time.sleep(PAUSE_DURATION)
-
-        raw_html = download_raw_html_cdp(url, cdp_port)
-        if raw_html is None:
-            print(f"  FAILED to download: {url}")
-            article["status"] = "failed"
-            article["errors"] = article.get("errors", []) + ["download failed"]
-            stats["failed"] += 1
-            save_manifest(articles, base_dir)
-            continue
-
-        try:
-            result = extract_article(
-                raw_html, str(articles_dir),
-                seq=seq, download_img=True, session=img_session,
-            )
-            article["status"] = "extracted"
-            article["dir_name"] = result.get("dir_name", "")
-            article["author"] = result.get("author", "")
-            article["publish_time"] = result.get("publish_time", "")
-            if result.get("errors"):
-                article["errors"] = result["errors"]
-            if result.get("img_stats"):
-                s = result["img_stats"]
-                print(f"  OK — images: {s['ok']}/{s['total']}, "
-                      f"failed: {s['failed']}, {s['bytes']} bytes")
-            else:
-                print(f"  OK — extracted")
-            stats["ok"] += 1
-        except Exception as e:
-            print(f"  FAILED extraction: {e}")
-            article["status"] = "failed"
-            article["errors"] = article.get("errors", []) + [str(e)]
-            stats["failed"] += 1
-
-        save_manifest(articles, base_dir)
+    try:
+        for idx in range(total):
+            article, raw_html = results.get()
+            seq = article.get("seq", idx + 1)
+            title = article.get("title", "Untitled")
+            url = article["source_path"]
+
+            print(f"\n[{idx + 1}/{total}] #{seq} {title[:40]}...")
+
+            if raw_html is None:
+                print(f"  FAILED to download: {url}")
+                article["status"] = "failed"
+                article["errors"] = article.get("errors", []) + ["download failed"]
+                stats["failed"] += 1
+                checkpoint.record(article)
+                continue
 
-        delay = random.uniform(DELAY_MIN, DELAY_MAX)
-        print(f"  Waiting {delay:.1f}s...")
-        time.sleep(delay)
+            try:
+                result = extract_article(
+                    raw_html, str(articles_dir),
+                    seq=seq, download_img=True, session=img_session,
+                )
+                article["status"] = "extracted"
+                article["dir_name"] = result.get("dir_name", "")
+                article["author"] = result.get("author", "")
+                article["publish_time"] = result.get("publish_time", "")
+                if result.get("errors"):
+                    article["errors"] = result["errors"]
+                if result.get("img_stats"):
+                    s = result["img_stats"]
+                    print(f"  OK — images: {s['ok']}/{s['total']}, "
+                          f"failed: {s['failed']}, {s['bytes']} bytes")
+                else:
+                    print(f"  OK — extracted")
+                stats["ok"] += 1
+            except Exception as e:
+                print(f"  FAILED extraction: {e}")
+                article["status"] = "failed"
+                article["errors"] = article.get("errors", []) + [str(e)]
+                stats["failed"] += 1
+
+            checkpoint.record(article)
+    finally:
+        checkpoint.flush()
+        # Don't leave our tabs in the user's Chrome on Ctrl+C / SIGTERM
+        for tab in tab_list:
+            tab.close()
+        cdp.close()
 
     elapsed = time.time() - start_time
     print(f"\n{'=' * 60}")
@@ -401,19 +491,19 @@ def crawl_articles(base_dir: Path, limit: int = 0, force: bool = False):
 # ---------------------------------------------------------------------------
 
 def show_stats(base_dir: Path):
-    articles = load_manifest(base_dir)
+    articles = load_manifest(base_dir, key="seq")
     if not articles:
         print("No manifest found.")
         return
 
     articles_dir = base_dir / "articles"
     total = len(articles)
-    by_status = {}
+    by_status = Counter()
+    ready = 0
     for a in articles:
-        s = a.get("status", "unknown")
-        by_status[s] = by_status.get(s, 0) + 1
-
-    ready = sum(1 for a in articles if a.get("media_state") == 2)
+        by_status[a.get("status", "unknown")] += 1
+        if a.get("media_state") == 2:
+            ready += 1
 
     print(f"Manifest: {base_dir / 'manifest.json'}")
     print(f"Total articles: {total}")
@@ -423,11 +513,10 @@ def show_stats(base_dir: Path):
         print(f"  {status}: {count}")
 
     if articles_dir.exists():
-        total_size = sum(
-            f.stat().st_size for f in articles_dir.rglob("*") if f.is_file()
-        )
+        total_size = tree_size(articles_dir)
         print(f"\nDisk usage: {total_size / 1024 / 1024:.1f} MB")
-        dir_count = sum(1 for d in articles_dir.iterdir() if d.is_dir())
+        with os.scandir(articles_dir) as it:
+            dir_count = sum(1 for e in it if e.is_dir(follow_symlinks=False))
         print(f"Article directories: {dir_count}")
 
 
@@ -435,8 +524,8 @@ def show_stats(base_dir: Path):
 # Phase: Retry failed
 # ---------------------------------------------------------------------------
 
-def retry_failed(base_dir: Path, limit: int = 0):
-    articles = load_manifest(base_dir)
+def retry_failed(base_dir: Path, limit: int = 0, tabs: int = DEFAULT_TABS):
+    articles = load_manifest(base_dir, key="seq")
     failed = [a for a in articles if a.get("status") == "failed"]
 
     if not failed:
@@ -449,7 +538,7 @@ def retry_failed(base_dir: Path, limit: int = 0):
         a["errors"] = []
     save_manifest(articles, base_dir)
 
-    crawl_articles(base_dir, limit=limit)
+    crawl_articles(base_dir, limit=limit, tabs=tabs)
 
 
 # ---------------------------------------------------------------------------
@@ -473,6 +562,8 @@ def main():
                         help="Max articles to process (0 = all)")
     parser.add_argument("--force", action="store_true",
                         help="Re-process already-done articles")
+    parser.add_argument("--tabs", type=int, default=DEFAULT_TABS,
+                        help=f"Chrome tabs fetching in parallel (default: {DEFAULT_TABS})")
 
     args = parser.parse_args()
 
@@ -485,11 +576,11 @@ def main():
                            headers_file=args.headers,
                            headers_json=args.headers_json)
     elif args.phase == "crawl":
-        crawl_articles(base_dir, limit=args.limit, force=args.force)
+        crawl_articles(base_dir, limit=args.limit, force=args.force, tabs=args.tabs)
     elif args.phase == "stats":
         show_stats(base_dir)
     elif args.phase == "retry":
-        retry_failed(base_dir, limit=args.limit)
+        retry_failed(base_dir, limit=args.limit, tabs=args.tabs)
 
 
 if __name__ == "__main__":
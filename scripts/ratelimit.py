@@ -0,0 +1,61 @@
+"""
+Adaptive client-side rate limiting shared by the crawler and the uploader.
+
+Usage:
+  from ratelimit import TokenBucket
+  bucket = TokenBucket(rate=5.0, burst=5)
+  bucket.acquire()          # before each request
+  bucket.succeeded()        # after a request the server accepted
+  bucket.throttled(pause)   # after a 429, with the server's reset time
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to server pushback.
+
+    acquire() blocks until a request may be sent. throttled() halves the
+    rate and holds every caller for the server's reset time; after
+    `ease_after` successes in a row the rate grows by 10%, up to max_rate.
+    """
+
+    def __init__(self, rate: float, burst: int, max_rate: float | None = None,
+                 min_rate: float = 0.1, ease_after: int = 100):
+        self.rate = rate
+        self.burst = burst
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate
+        self.ease_after = ease_after
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._resume_at = 0.0
+        self._ok_streak = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if now >= self._resume_at and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._resume_at - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def succeeded(self):
+        with self._lock:
+            self._ok_streak += 1
+            if self._ok_streak >= self.ease_after:
+                self._ok_streak = 0
+                self.rate = min(self.rate * 1.1, self.max_rate)
+
+    def throttled(self, pause: float):
+        with self._lock:
+            self._ok_streak = 0
+            self.rate = max(self.rate * 0.5, self.min_rate)
+            self._tokens = 0.0
+            self._resume_at = max(self._resume_at, time.monotonic() + pause)
@@ -3,7 +3,7 @@
 Extract WeChat article content to clean HTML and Markdown.
 
 Features:
-- BeautifulSoup-based HTML parsing (replaces fragile regex)
+- BeautifulSoup-based HTML parsing with lxml (replaces fragile regex)
 - Image download to local assets/ directory
 - Cleans visibility:hidden / opacity:0 styles
 - Video/audio metadata extraction
@@ -19,12 +19,17 @@ import sys
 import re
 import html
 import hashlib
+import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, Comment, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -41,29 +46,78 @@ IMG_HEADERS = {
 
 IMG_TIMEOUT = 30  # seconds per image download
 IMG_RETRY = 2
+IMG_POOL_HOSTS = 16   # image CDN hosts kept in the connection pool
+IMG_POOL_SIZE = 32    # keep-alive connections per host
+IMG_WORKERS = 16      # concurrent image downloads per process (see set_image_workers)
+IMG_CHUNK = 64 * 1024  # bytes per write while streaming an image to disk
+ASSET_INDEX_NAME = ".manifest.json"  # per-article image URL -> file + validators
+
+# Patterns compiled once at import
+_TITLE_RE = re.compile(r"var msg_title = [\"'](.+?)[\"']")
+_NICKNAME_RE = re.compile(r"var nickname = [\"'](.+?)[\"']")
+_CT_RE = re.compile(r"var ct\s*=\s*[\"'](\d+)[\"']")
+_SOURCE_URL_RE = re.compile(r"var msg_source_url = '(https?://[^']+)'")
+_HIDDEN_STYLE_RE = re.compile(
+    r"visibility\s*:\s*hidden|opacity\s*:\s*0(?:[;\s]|$)|display\s*:\s*none"
+)
+_VIDEO_CLASS_RE = re.compile(r"video_iframe|mpvideo")
+_AUDIO_CLASS_RE = re.compile(r"audio_iframe|mpvoice")
+_WX_FMT_RE = re.compile(r"wx_fmt=(\w+)")
+_SPACES_RE = re.compile(r'[ \t]+')
+_CODE_LANG_RE = re.compile(r'language-(\w+)')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_TRAILING_WS_RE = re.compile(r'[ \t]+\n')
+
+# Image Content-Type -> file extension, and extensions taken as-is from a URL
+_CT_TO_EXT = {
+    "image/png": ".png", "image/x-png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "image/jpeg": ".jpg", "image/jpg": ".jpg", "image/pjpeg": ".jpg",
+}
+_URL_IMG_EXTS = {".png", ".gif", ".webp", ".svg", ".jpg", ".jpeg"}
+
+# Builds only the article body (and its descendants) when parsing a page
+_CONTENT_STRAINER = SoupStrainer(id="js_content")
 
 # ---------------------------------------------------------------------------
 # Metadata extraction
 # ---------------------------------------------------------------------------
 
-def extract_title(raw_html: str) -> str:
-    m = re.search(r"var msg_title = [\"'](.+?)[\"']", raw_html)
+def _parse(markup: str, parse_only: SoupStrainer = None) -> BeautifulSoup:
+    """Parse HTML with lxml's C parser (much faster than html.parser on 1 MB pages)."""
+    return BeautifulSoup(markup, "lxml", parse_only=parse_only)
+
+
+def extract_title(raw_html: str, soup: BeautifulSoup = None) -> str:
+    return _title_from(_TITLE_RE.search(raw_html), raw_html, soup)
+
+
+def _title_from(m: re.Match | None, raw_html: str, soup: BeautifulSoup = None) -> str:
+    """extract_title given the result of _TITLE_RE.search(raw_html)."""
     if m:
         title = m.group(1).split("'")[0].split('"')[0]
         return html.unescape(title).strip()
-    soup = BeautifulSoup(raw_html, "html.parser")
+    if soup is None:
+        soup = _parse(raw_html)
     h1 = soup.select_one('h1.rich_media_title')
     if h1:
         return h1.get_text(strip=True)
     return "Untitled"
 
 
-def extract_author(raw_html: str) -> str:
-    m = re.search(r"var nickname = [\"'](.+?)[\"']", raw_html)
+def extract_author(raw_html: str, soup: BeautifulSoup = None) -> str:
+    return _author_from(_NICKNAME_RE.search(raw_html), raw_html, soup)
+
+
+def _author_from(m: re.Match | None, raw_html: str, soup: BeautifulSoup = None) -> str:
+    """extract_author given the result of _NICKNAME_RE.search(raw_html)."""
     if m:
         return html.unescape(m.group(1)).strip()
     # Fallback: try profile_nickname span
-    soup = BeautifulSoup(raw_html, "html.parser")
+    if soup is None:
+        soup = _parse(raw_html)
     nick = soup.select_one('#js_name, .rich_media_meta_nickname .rich_media_meta_link')
     if nick:
         return nick.get_text(strip=True)
@@ -71,7 +125,7 @@ def extract_author(raw_html: str) -> str:
 
 
 def extract_publish_time(raw_html: str) -> str:
-    m = re.search(r"var ct\s*=\s*[\"'](\d+)[\"']", raw_html)
+    m = _CT_RE.search(raw_html)
     if m:
         ts = int(m.group(1))
         return time.strftime("%Y-%m-%d", time.localtime(ts))
@@ -79,7 +133,7 @@ def extract_publish_time(raw_html: str) -> str:
 
 
 def extract_source_url(raw_html: str) -> str:
-    m = re.search(r"var msg_source_url = '(https?://[^']+)'", raw_html)
+    m = _SOURCE_URL_RE.search(raw_html)
     if m:
         return m.group(1)
     return ""
@@ -89,35 +143,18 @@ def extract_source_url(raw_html: str) -> str:
 # Content extraction (BeautifulSoup)
 # ---------------------------------------------------------------------------
 
-def _remove_hidden_elements(soup: BeautifulSoup) -> None:
-    """Remove elements with visibility:hidden or opacity:0 inline styles."""
-    for tag in soup.find_all(style=True):
-        style = tag.get("style", "") if tag.attrs else ""
-        if re.search(r"visibility\s*:\s*hidden", style) or \
-           re.search(r"opacity\s*:\s*0(?:[;\s]|$)", style) or \
-           re.search(r"display\s*:\s*none", style):
-            tag.decompose()
-
-
-def _remove_unwanted_tags(soup: BeautifulSoup) -> None:
-    """Remove script, style, link, meta, comments, and mpvoice/mpvideo placeholders."""
-    for tag in soup.find_all(["script", "style", "link", "meta", "noscript", "iframe"]):
-        tag.decompose()
-    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-        comment.extract()
-
-
-def _fix_images(soup: BeautifulSoup) -> None:
-    """Replace data-src with src for WeChat lazy-loaded images."""
-    for img in soup.find_all("img"):
-        data_src = img.get("data-src")
-        if data_src:
-            img["src"] = data_src
-            del img["data-src"]
-        # Remove data-* clutter
-        for attr in list(img.attrs):
-            if attr.startswith("data-") and attr != "data-src":
-                del img[attr]
+_UNWANTED_TAGS = frozenset({"script", "style", "link", "meta", "noscript", "iframe"})
+
+
+def _fix_image(img) -> None:
+    """Replace data-src with src for a WeChat lazy-loaded image."""
+    attrs = img.attrs
+    data_src = attrs.pop("data-src", None)
+    if data_src:
+        attrs["src"] = data_src
+    # Remove data-* clutter
+    for attr in [a for a in attrs if a.startswith("data-")]:
+        del attrs[attr]
 
 
 def _make_placeholder(soup: BeautifulSoup, text: str, css_class: str):
@@ -128,53 +165,98 @@ def _make_placeholder(soup: BeautifulSoup, text: str, css_class: str):
     return p
 
 
-def _extract_video_info(content, soup: BeautifulSoup) -> list:
-    """Extract video metadata from mpvideo tags."""
-    videos = []
-    for v in content.find_all(attrs={"class": re.compile(r"video_iframe|mpvideo")}):
-        vid_title = v.get("data-title", "").strip()
-        vid_src = v.get("data-src", v.get("src", "")).strip()
+def _media_kind(tag) -> str | None:
+    """Classify a video/audio embed: "video", "audio", "mpvoice" or None."""
+    cls = tag.attrs.get("class")
+    if cls:
+        cls = " ".join(cls)
+        if _VIDEO_CLASS_RE.search(cls):
+            return "video"
+        if _AUDIO_CLASS_RE.search(cls):
+            return "audio"
+    if tag.name == "mpvoice":
+        return "mpvoice"
+    return None
+
+
+def _replace_media(tag, kind: str, soup: BeautifulSoup,
+                   videos: list, audios: list) -> None:
+    """Swap a video/audio embed for a placeholder, recording its metadata."""
+    if kind == "video":
+        vid_title = tag.get("data-title", "").strip()
+        vid_src = tag.get("data-src", tag.get("src", "")).strip()
         videos.append({"title": vid_title or "未命名视频", "src": vid_src})
-        v.replace_with(
+        tag.replace_with(
             _make_placeholder(soup, f"[视频: {vid_title or '未命名视频'}]", "video-placeholder")
         )
-    return videos
-
+        return
+    if kind == "audio":
+        aud_name = tag.get("name", tag.get("data-title", "")).strip()
+    else:
+        aud_name = tag.get("name", "").strip()
+    audios.append({"name": aud_name or "未命名音频"})
+    tag.replace_with(
+        _make_placeholder(soup, f"[音频: {aud_name or '未命名音频'}]", "audio-placeholder")
+    )
+
+
+def _clean_content(content, soup: BeautifulSoup) -> tuple[list, list]:
+    """
+    Clean #js_content in place in one top-down walk; return (videos, audios).
+
+    Comments are dropped; script/style/iframe/... tags and elements hidden
+    by an inline style (visibility:hidden, opacity:0, display:none) are
+    removed; lazy-loaded images get their real src; video/audio embeds
+    become placeholders. Removed or replaced elements are not descended
+    into. Each element's children are copied before visiting them, so
+    editing the tree while walking is safe.
+    """
+    videos, audios = [], []
+    stack = [iter(list(content.children))]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+        if not isinstance(node, Tag):
+            if isinstance(node, Comment):
+                node.extract()
+            continue
+        if node.name in _UNWANTED_TAGS \
+                or _HIDDEN_STYLE_RE.search(node.attrs.get("style", "")):
+            node.decompose()
+            continue
+        if node.name == "img":
+            _fix_image(node)
+        kind = _media_kind(node)
+        if kind:
+            _replace_media(node, kind, soup, videos, audios)
+            continue
+        stack.append(iter(list(node.children)))
+    return videos, audios
 
-def _extract_audio_info(content, soup: BeautifulSoup) -> list:
-    """Extract audio metadata from mpvoice tags."""
-    audios = []
-    for a in content.find_all(attrs={"class": re.compile(r"audio_iframe|mpvoice")}):
-        aud_name = a.get("name", a.get("data-title", "")).strip()
-        audios.append({"name": aud_name or "未命名音频"})
-        a.replace_with(
-            _make_placeholder(soup, f"[音频: {aud_name or '未命名音频'}]", "audio-placeholder")
-        )
-    # Also handle <mpvoice> custom tags
-    for a in content.find_all("mpvoice"):
-        aud_name = a.get("name", "").strip()
-        audios.append({"name": aud_name or "未命名音频"})
-        a.replace_with(
-            _make_placeholder(soup, f"[音频: {aud_name or '未命名音频'}]", "audio-placeholder")
-        )
-    return audios
 
+def extract_content_soup(raw_html: str, soup: BeautifulSoup = None) -> BeautifulSoup:
+    """
+    Return a cleaned BeautifulSoup of #js_content.
 
-def extract_content_soup(raw_html: str) -> BeautifulSoup:
-    """Parse raw HTML and return a cleaned BeautifulSoup of #js_content."""
-    soup = BeautifulSoup(raw_html, "html.parser")
+    Pass the page's already-parsed soup to skip parsing raw_html again;
+    it is modified in place. Without one, only #js_content is built (via
+    _CONTENT_STRAINER), falling back to a full parse if it is missing.
+    """
+    if soup is None:
+        soup = _parse(raw_html, _CONTENT_STRAINER)
+        if not soup.find(id="js_content"):
+            # The fallback below needs the whole page
+            soup = _parse(raw_html)
     content_div = soup.find(id="js_content")
     if not content_div:
         # Fallback: try rich_media_content
         content_div = soup.select_one('.rich_media_content')
     if not content_div:
-        return BeautifulSoup("", "html.parser")
+        return _parse("")
 
-    _remove_unwanted_tags(content_div)
-    _remove_hidden_elements(content_div)
-    _fix_images(content_div)
-    _extract_video_info(content_div, soup)
-    _extract_audio_info(content_div, soup)
+    _clean_content(content_div, soup)
 
     return content_div
 
@@ -186,38 +268,165 @@ def extract_content_soup(raw_html: str) -> BeautifulSoup:
 def _img_ext(url: str, content_type: str = "") -> str:
     """Determine image file extension from URL or Content-Type."""
     if content_type:
-        ct = content_type.lower()
-        if "png" in ct:
-            return ".png"
-        if "gif" in ct:
-            return ".gif"
-        if "webp" in ct:
-            return ".webp"
-        if "svg" in ct:
-            return ".svg"
-        if "jpeg" in ct or "jpg" in ct:
-            return ".jpg"
-    # Guess from URL
-    path = urlparse(url).path.lower()
-    for ext in (".png", ".gif", ".webp", ".svg", ".jpg", ".jpeg"):
-        if ext in path:
+        mime = content_type.split(";", 1)[0].strip().lower()
+        ext = _CT_TO_EXT.get(mime)
+        if ext:
             return ext
+    # Guess from URL
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    if ext in _URL_IMG_EXTS:
+        return ext
     # WeChat mmbiz default
-    fmt = re.search(r"wx_fmt=(\w+)", url)
+    fmt = _WX_FMT_RE.search(url)
     if fmt:
         f = fmt.group(1).lower()
         return f".{f}" if f != "jpeg" else ".jpg"
     return ".jpg"
 
 
+def new_image_session() -> requests.Session:
+    """Create a requests.Session with a connection pool sized for image CDNs."""
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=IMG_POOL_HOSTS,
+                          pool_maxsize=IMG_POOL_SIZE)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+_img_pool: ThreadPoolExecutor | None = None
+_img_session: requests.Session | None = None
+_img_pool_lock = threading.Lock()
+_img_workers = IMG_WORKERS
+
+
+def set_image_workers(n: int):
+    """
+    Set this process's concurrent image downloads; call before the first
+    download. Multi-process callers split one budget across processes so
+    the image CDN sees a bounded number of connections overall.
+    """
+    global _img_workers
+    _img_workers = max(1, n)
+
+
+def _image_pool() -> ThreadPoolExecutor:
+    """Download threads shared by every article in this process, started on first use."""
+    global _img_pool
+    with _img_pool_lock:
+        if _img_pool is None:
+            _img_pool = ThreadPoolExecutor(max_workers=_img_workers,
+                                           thread_name_prefix="img")
+        return _img_pool
+
+
+def _default_session() -> requests.Session:
+    """Image session used when callers pass none, so keep-alive spans articles."""
+    global _img_session
+    with _img_pool_lock:
+        if _img_session is None:
+            _img_session = new_image_session()
+        return _img_session
+
+
+def _reset_image_pool():
+    # A forked child inherits the pool object but none of its threads,
+    # and must not share the parent's pooled sockets
+    global _img_pool, _img_session, _img_pool_lock
+    _img_pool = None
+    _img_session = None
+    _img_pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_image_pool)
+
+
+def _load_asset_index(assets_dir: Path) -> dict:
+    try:
+        index = json.loads((assets_dir / ASSET_INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _save_asset_index(assets_dir: Path, index: dict):
+    path = assets_dir / ASSET_INDEX_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _download_one(sess: requests.Session, src: str, filepath: Path,
+                  cached: dict | None = None) -> tuple[int, dict]:
+    """Download one image with retry; return (bytes written, validators).
+
+    Bytes is -1 on failure and 0 if `cached` (an asset index entry) is
+    still current: its ETag / Last-Modified are sent as a conditional GET
+    and the server answered 304. Validators are the response's ETag and
+    Last-Modified, for the asset index.
+
+    The body is streamed to a .part file and renamed into place, so an
+    interrupted download never leaves a truncated image behind.
+    """
+    headers = IMG_HEADERS
+    if cached:
+        headers = dict(IMG_HEADERS)
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    part_path = filepath.with_name(filepath.name + ".part")
+    for attempt in range(IMG_RETRY + 1):
+        try:
+            with sess.get(src, headers=headers, timeout=IMG_TIMEOUT,
+                          stream=True) as resp:
+                if cached and resp.status_code == 304:
+                    return 0, {}
+                resp.raise_for_status()
+                validators = {
+                    k: v for k, v in (("etag", resp.headers.get("ETag")),
+                                      ("last_modified", resp.headers.get("Last-Modified")))
+                    if v
+                }
+                with open(part_path, "wb") as fh:
+                    for chunk in resp.iter_content(IMG_CHUNK):
+                        fh.write(chunk)
+                    size = fh.tell()
+            if size < 100:
+                # Likely an error page, not a real image
+                raise ValueError(f"Image too small ({size} bytes)")
+            os.replace(part_path, filepath)
+            return size, validators
+        except Exception:
+            part_path.unlink(missing_ok=True)
+            if attempt < IMG_RETRY:
+                time.sleep(1 * (attempt + 1))
+            continue
+    return -1, {}
+
+
 def download_images(content_soup: BeautifulSoup, assets_dir: Path,
                     session: requests.Session = None) -> dict:
-    """Download all images in content_soup to assets_dir, return stats."""
+    """Download all images in content_soup to assets_dir, return stats.
+
+    Images are fetched concurrently on the shared download pool (threads
+    sharing the session's connection pool) and applied as each one
+    completes; the soup is only touched from this thread.
+
+    assets/.manifest.json remembers each downloaded URL's file and
+    ETag / Last-Modified, so when a rerun numbers an image differently
+    the earlier copy is revalidated with a conditional GET instead of
+    being downloaded again.
+    """
     assets_dir.mkdir(parents=True, exist_ok=True)
-    sess = session or requests.Session()
+    sess = session or _default_session()
+    index = _load_asset_index(assets_dir)
+    index_changed = False
 
     stats = {"total": 0, "ok": 0, "failed": 0, "skipped": 0, "bytes": 0}
     img_counter = 0
+    jobs = []  # (img tag, src, filename, filepath, asset index entry or None)
 
     for img in content_soup.find_all("img"):
         src = img.get("src", "")
@@ -240,33 +449,46 @@ def download_images(content_soup: BeautifulSoup, assets_dir: Path,
             stats["ok"] += 1
             continue
 
-        # Download with retry
-        ok = False
-        for attempt in range(IMG_RETRY + 1):
-            try:
-                resp = sess.get(src, headers=IMG_HEADERS, timeout=IMG_TIMEOUT,
-                                stream=True)
-                resp.raise_for_status()
-                data = resp.content
-                if len(data) < 100:
-                    # Likely an error page, not a real image
-                    raise ValueError(f"Image too small ({len(data)} bytes)")
-                filepath.write_bytes(data)
-                img["src"] = f"assets/{filename}"
-                stats["ok"] += 1
-                stats["bytes"] += len(data)
-                ok = True
-                break
-            except Exception:
-                if attempt < IMG_RETRY:
-                    time.sleep(1 * (attempt + 1))
-                continue
-
-        if not ok:
+        cached = index.get(src)
+        if not (isinstance(cached, dict) and cached.get("file")
+                and (assets_dir / cached["file"]).is_file()):
+            cached = None
+        jobs.append((img, src, filename, filepath, cached))
+
+    if not jobs:
+        return stats
+
+    pool = _image_pool()
+    futures = {
+        pool.submit(_download_one, sess, src, filepath, cached): (img, src, filename, cached)
+        for img, src, filename, filepath, cached in jobs
+    }
+    # Apply results as they finish; only this thread touches soup/stats
+    for future in as_completed(futures):
+        img, src, filename, cached = futures[future]
+        size, validators = future.result()
+        if size == 0:
+            # 304: the copy from an earlier run is still current
+            img["src"] = f"assets/{cached['file']}"
+            stats["skipped"] += 1
+            stats["ok"] += 1
+        elif size > 0:
+            img["src"] = f"assets/{filename}"
+            stats["ok"] += 1
+            stats["bytes"] += size
+            if validators:
+                index[src] = {"file": filename, **validators}
+                index_changed = True
+        else:
             stats["failed"] += 1
             # Keep original URL as fallback
             img["src"] = src
 
+    if index_changed:
+        try:
+            _save_asset_index(assets_dir, index)
+        except OSError:
+            pass  # only an optimization for the next run
     return stats
 
 
@@ -276,14 +498,19 @@ def download_images(content_soup: BeautifulSoup, assets_dir: Path,
 
 def build_clean_html(title: str, author: str, source_url: str,
                      publish_time: str, content_html: str) -> str:
+    # Escape each field once; several are used more than once below
+    e_title = html.escape(title)
+    e_author = html.escape(author)
+    e_source_url = html.escape(source_url)
+
     meta_parts = []
     if author:
-        meta_parts.append(f"作者: {html.escape(author)}")
+        meta_parts.append(f"作者: {e_author}")
     if publish_time:
         meta_parts.append(f"发布: {html.escape(publish_time)}")
     if source_url:
         meta_parts.append(
-            f'来源: <a href="{html.escape(source_url)}">{html.escape(source_url)}</a>'
+            f'来源: <a href="{e_source_url}">{e_source_url}</a>'
         )
     meta_html = "<br>\n  ".join(meta_parts)
 
@@ -292,9 +519,9 @@ def build_clean_html(title: str, author: str, source_url: str,
 <head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1">
-<title>{html.escape(title)}</title>
-<meta name="author" content="{html.escape(author)}">
-<meta name="source-url" content="{html.escape(source_url)}">
+<title>{e_title}</title>
+<meta name="author" content="{e_author}">
+<meta name="source-url" content="{e_source_url}">
 <style>
 body {{
   max-width: 680px;
@@ -319,7 +546,7 @@ a {{ color: #576b95; text-decoration: none; }}
 </style>
 </head>
 <body>
-<h1>{html.escape(title)}</h1>
+<h1>{e_title}</h1>
 <div class="meta">
   {meta_html}
 </div>
@@ -332,16 +559,71 @@ a {{ color: #576b95; text-decoration: none; }}
 # HTML to Markdown conversion
 # ---------------------------------------------------------------------------
 
+def _strip_wrap(before: str, after: str):
+    """Finisher: wrap a frame's stripped text, or drop it if empty."""
+    def finish(parts: list) -> str:
+        text = ''.join(parts).strip()
+        return f"{before}{text}{after}" if text else ""
+    return finish
+
+
+def _finish_quote(parts: list) -> str:
+    text = ''.join(parts).strip()
+    if not text:
+        return ""
+    quoted = '\n'.join(f"> {line}" for line in text.split('\n'))
+    return f"\n\n{quoted}\n\n"
+
+
+def _finish_list(parts: list) -> str:
+    return "\n\n" + "\n".join(parts) + "\n\n" if parts else ""
+
+
+_finish_inline = ''.join
+_finish_strong = _strip_wrap("**", "**")
+_finish_em = _strip_wrap("*", "*")
+_finish_paragraph = _strip_wrap("\n\n", "\n\n")
+
+
+def _list_item_frames(list_tag):
+    """Frames for the direct <li> children of a <ul>/<ol>, numbered in order."""
+    ordered = list_tag.name == 'ol'
+    for idx, li in enumerate(list_tag.find_all('li', recursive=False)):
+        prefix = f"{idx + 1}. " if ordered else "- "
+        yield (iter(li.children), [], _strip_wrap(prefix, ""))
+
+
 def _soup_to_markdown(soup) -> str:
-    """Convert BeautifulSoup element to Markdown recursively."""
-    parts = []
+    """
+    Convert BeautifulSoup element to Markdown.
+
+    Walks the tree with an explicit stack rather than recursion, so deeply
+    nested <section> scaffolding cannot hit the recursion limit. A frame is
+    (children iterator, output parts, finisher); when its children run out
+    the finisher turns the parts into the text added to the parent frame.
+    A list frame's iterator yields its item frames directly.
+    """
+    out = []
+    stack = [(iter(soup.children), out, _finish_inline)]
+
+    while stack:
+        children, parts, finish = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if stack:
+                text = finish(parts)
+                if text:
+                    stack[-1][1].append(text)
+            continue
+
+        if isinstance(child, tuple):
+            stack.append(child)
+            continue
 
-    for child in soup.children:
         if isinstance(child, str):
-            text = child
             # Collapse whitespace but preserve newlines
-            text = re.sub(r'[ \t]+', ' ', text)
-            parts.append(text)
+            parts.append(_SPACES_RE.sub(' ', child))
             continue
 
         if not hasattr(child, 'name'):
@@ -359,23 +641,20 @@ def _soup_to_markdown(soup) -> str:
                 parts.append(f"\n\n{'#' * level} {text}\n\n")
 
         elif tag in ('strong', 'b'):
-            text = _soup_to_markdown(child).strip()
-            if text:
-                parts.append(f"**{text}**")
+            stack.append((iter(child.children), [], _finish_strong))
 
         elif tag in ('em', 'i'):
-            text = _soup_to_markdown(child).strip()
-            if text:
-                parts.append(f"*{text}*")
+            stack.append((iter(child.children), [], _finish_em))
 
         elif tag == 'img':
-            src = child.get('src', '')
-            alt = child.get('alt', '')
+            attrs = child.attrs
+            src = attrs.get('src', '')
+            alt = attrs.get('alt', '')
             if src:
                 parts.append(f"\n\n![{alt}]({src})\n\n")
 
         elif tag == 'a':
-            href = child.get('href', '')
+            href = child.attrs.get('href', '')
             text = child.get_text(strip=True)
             if text and href and not href.startswith('javascript:'):
                 parts.append(f"[{text}]({href})")
@@ -389,26 +668,21 @@ def _soup_to_markdown(soup) -> str:
             parts.append("\n\n---\n\n")
 
         elif tag == 'p':
-            text = _soup_to_markdown(child).strip()
-            if text:
-                parts.append(f"\n\n{text}\n\n")
+            stack.append((iter(child.children), [], _finish_paragraph))
 
         elif tag == 'blockquote':
-            text = _soup_to_markdown(child).strip()
-            if text:
-                quoted = '\n'.join(f"> {line}" for line in text.split('\n'))
-                parts.append(f"\n\n{quoted}\n\n")
+            stack.append((iter(child.children), [], _finish_quote))
 
         elif tag == 'pre':
             code = child.find('code')
             text = (code or child).get_text()
             lang = ''
-            if code and code.get('class'):
-                for cls in code['class']:
-                    m = re.match(r'language-(\w+)', cls)
-                    if m:
-                        lang = m.group(1)
-                        break
+            classes = code.attrs.get('class') if code else None
+            for cls in classes or ():
+                m = _CODE_LANG_RE.match(cls)
+                if m:
+                    lang = m.group(1)
+                    break
             parts.append(f"\n\n```{lang}\n{text}\n```\n\n")
 
         elif tag == 'code':
@@ -416,23 +690,15 @@ def _soup_to_markdown(soup) -> str:
             parts.append(f"`{text}`")
 
         elif tag in ('ul', 'ol'):
-            items = child.find_all('li', recursive=False)
-            list_parts = []
-            for idx, li in enumerate(items):
-                text = _soup_to_markdown(li).strip()
-                if text:
-                    prefix = f"{idx + 1}. " if tag == 'ol' else "- "
-                    list_parts.append(f"{prefix}{text}")
-            if list_parts:
-                parts.append("\n\n" + "\n".join(list_parts) + "\n\n")
+            stack.append((_list_item_frames(child), [], _finish_list))
 
         elif tag == 'table':
             rows = child.find_all('tr')
             if rows:
                 table_data = []
                 for tr in rows:
-                    cells = tr.find_all(['td', 'th'])
-                    row = [c.get_text(strip=True).replace('|', '\\|') for c in cells]
+                    row = [c.get_text(strip=True).replace('|', '\\|')
+                           for c in tr.children if c.name in ('td', 'th')]
                     table_data.append(row)
                 if table_data:
                     col_count = max(len(r) for r in table_data)
@@ -447,10 +713,10 @@ def _soup_to_markdown(soup) -> str:
                     parts.append(f"\n\n{header}\n{sep}\n{body}\n\n")
 
         else:
-            # div, section, span, etc. — recurse
-            parts.append(_soup_to_markdown(child))
+            # div, section, span, etc. — descend
+            stack.append((iter(child.children), [], _finish_inline))
 
-    return ''.join(parts)
+    return ''.join(out)
 
 
 def html_to_markdown(content_soup, title: str = "", author: str = "",
@@ -459,8 +725,8 @@ def html_to_markdown(content_soup, title: str = "", author: str = "",
     md = _soup_to_markdown(content_soup)
 
     # Clean up whitespace
-    md = re.sub(r'\n{3,}', '\n\n', md)
-    md = re.sub(r'[ \t]+\n', '\n', md)
+    md = _BLANK_LINES_RE.sub('\n\n', md)
+    md = _TRAILING_WS_RE.sub('\n', md)
     md = md.strip()
 
     # Build header
@@ -483,9 +749,25 @@ def html_to_markdown(content_soup, title: str = "", author: str = "",
 # High-level API
 # ---------------------------------------------------------------------------
 
+class _SafeNameTable(dict):
+    """str.translate table: word characters, CJK and '-' kept, rest -> '_'.
+
+    Filled lazily per codepoint, so repeat characters are a dict hit.
+    """
+
+    def __missing__(self, cp: int) -> int:
+        ch = chr(cp)
+        keep = ch.isalnum() or ch in "_-" or 0x4e00 <= cp <= 0x9fff
+        self[cp] = cp if keep else ord("_")
+        return self[cp]
+
+
+_SAFE_NAME_TABLE = _SafeNameTable()
+
+
 def safe_dirname(title: str, seq: int = 0) -> str:
     """Generate a filesystem-safe directory name with optional sequence prefix."""
-    safe = re.sub(r'[^\w\u4e00-\u9fff-]', '_', title)[:50].rstrip('_')
+    safe = title[:50].translate(_SAFE_NAME_TABLE).rstrip('_')
     if not safe:
         safe = "untitled"
     if seq > 0:
@@ -504,7 +786,7 @@ def extract_article(raw_html: str, output_dir: str | Path,
         output_dir: Base directory to write output into
         seq: Sequence number for directory prefix (0 = no prefix)
         download_img: Whether to download images locally
-        session: Optional requests.Session for connection reuse
+        session: Optional requests.Session (default: one shared per process)
 
     Returns:
         dict with keys: title, author, publish_time, source_url,
@@ -516,9 +798,17 @@ def extract_article(raw_html: str, output_dir: str | Path,
         "img_stats": {}, "errors": [],
     }
 
+    # Parse the whole page only when a metadata fallback needs the DOM (and
+    # then share it); otherwise extract_content_soup builds just #js_content.
+    # The regex matches are handed on so the page is scanned once per field.
+    soup = None
     try:
-        title = extract_title(raw_html)
-        author = extract_author(raw_html)
+        title_m = _TITLE_RE.search(raw_html)
+        author_m = _NICKNAME_RE.search(raw_html)
+        if not (title_m and author_m):
+            soup = _parse(raw_html)
+        title = _title_from(title_m, raw_html, soup)
+        author = _author_from(author_m, raw_html, soup)
         publish_time = extract_publish_time(raw_html)
         source_url = extract_source_url(raw_html)
     except Exception as e:
@@ -535,7 +825,7 @@ def extract_article(raw_html: str, output_dir: str | Path,
 
     # Parse content
     try:
-        content_soup = extract_content_soup(raw_html)
+        content_soup = extract_content_soup(raw_html, soup)
     except Exception as e:
         result["errors"].append(f"content extraction: {e}")
         return result